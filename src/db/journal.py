@@ -0,0 +1,150 @@
+import json
+import os
+import queue
+import threading
+import time
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "journals")
+
+# Longest a queued event waits for company before its batch is written and fsynced
+GROUP_COMMIT_SEC = 0.25
+
+_STOP = object()
+
+
+def journal_path(attempt_uuid, root=None):
+    return os.path.join(root or JOURNAL_DIR, f"{attempt_uuid}.jsonl")
+
+
+class AttemptJournal:
+    """
+    Append-only JSONL log of an in-progress test (answers, question states, per-question time, timer).
+    record() only queues the event; a background thread writes whatever has queued up as one
+    batch (group commit) followed by a single fsync, so the GUI thread never waits on the disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="test-journal", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def for_attempt(cls, attempt_uuid, root=None):
+        return cls(journal_path(attempt_uuid, root))
+
+    def record(self, kind, **fields):
+        """Queue one event; `kind` names it and fields must be JSON-serializable."""
+        if self._closed:
+            return
+        fields["e"] = kind
+        self._queue.put(json.dumps(fields, separators=(",", ":")))
+
+    def flush(self):
+        """Block until every event recorded so far is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write out pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def discard(self):
+        """Close the journal and delete its file (the attempt was submitted or abandoned)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                # Group commit: gather what arrives within the window into one write; flush and
+                # close requests end the window early
+                deadline = time.monotonic() + GROUP_COMMIT_SEC
+                while isinstance(batch[-1], str):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                lines = []
+                waiters = []
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        lines.append(item)
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                for w in waiters:
+                    w.set()
+
+
+def replay_journal(path):
+    """
+    Rebuild test state from a journal: a dict with the "start" event's settings plus
+    answers, question_types, question_states, review_flags, time_spent, current_question, time_left_sec
+    and hints_used (question index -> hints shown, learning mode).
+    Each event is applied in constant time; a torn last line from a crash is ignored.
+    Returns None if the journal has no start event.
+    """
+    state = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            kind = event.get("e")
+            if kind == "start":
+                n = event["num_questions"]
+                state = dict(event)
+                state.update(answers=[None] * n, question_types=["mcq"] * n,
+                             question_states=["not_visited"] * n, review_flags=[False] * n,
+                             time_spent=[0.0] * n, current_question=0, time_left_sec=event["time_limit"] * 60,
+                             hints_used={})
+            elif state is None:
+                continue
+            elif kind == "q":
+                i = event["i"]
+                state["answers"][i] = event["answer"]
+                state["question_types"][i] = event["type"]
+                state["question_states"][i] = event["state"]
+                state["review_flags"][i] = event["review"]
+            elif kind == "time":
+                state["time_spent"][event["i"]] = event["sec"]
+            elif kind == "nav":
+                state["current_question"] = event["i"]
+            elif kind == "timer":
+                state["time_left_sec"] = event["left"]
+            elif kind == "hint":
+                state["hints_used"][event["i"]] = event["used"]
+    return state
+
+
+def unfinished_journals(root=None):
+    """Journal files of tests that were neither submitted nor discarded, newest first."""
+    root = root or JOURNAL_DIR
+    if not os.path.isdir(root):
+        return []
+    paths = [os.path.join(root, name) for name in os.listdir(root) if name.endswith(".jsonl")]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
@@ -1,76 +1,415 @@
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
+from utils.answers import MCQ_MAP_LETTER_TO_IDX, encode_answer, grade_answer
 
 DB_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "db.sqlite3")
 
+# Connection tuning: WAL lets readers run alongside the writer, NORMAL sync is durable in WAL mode
+# except for the last transactions on power loss, and mmap avoids read() copies on large histories.
+MMAP_SIZE = 256 * 1024 * 1024
+# Per-connection cache of compiled statements; every query below is a fixed string, so each is
+# prepared once per connection and reused
+CACHED_STATEMENTS = 128
+
+_local = threading.local()
+
+INSERT_ATTEMPT_SQL = """
+    INSERT INTO attempts (attempt_uuid, question_index, selected_answer, correct_answer, time_spent_sec, hint_count,
+                          answer_type, selected_value, selected_numeric,
+                          correct_type, correct_value, correct_numeric, is_correct, marks)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_ATTEMPTS_SQL = """
+    SELECT question_index, selected_answer, correct_answer, time_spent_sec, hint_count, timestamp,
+           answer_type, selected_value, selected_numeric, correct_type, correct_value, correct_numeric,
+           is_correct, marks
+    FROM attempts
+    WHERE attempt_uuid = ?
+    ORDER BY question_index
+"""
+
+DELETE_ATTEMPTS_SQL = "DELETE FROM attempts WHERE attempt_uuid = ?"
+
+UPSERT_SESSION_SQL = """
+    INSERT OR REPLACE INTO sessions
+        (attempt_uuid, exam_type, pdf_hash, num_questions, time_limit_min, marks_per_correct, negative_mark)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_SESSION_SQL = """
+    SELECT attempt_uuid, exam_type, pdf_hash, num_questions, time_limit_min, marks_per_correct,
+           negative_mark, created_at
+    FROM sessions
+    WHERE attempt_uuid = ?
+"""
+
+DELETE_SESSION_SQL = "DELETE FROM sessions WHERE attempt_uuid = ?"
+
+# Keyset-paginated scan for bulk regrading: each chunk resumes after the last id seen
+SELECT_GRADING_CHUNK_SQL = """
+    SELECT a.id, a.attempt_uuid, a.question_index, a.answer_type, a.selected_value, a.selected_numeric,
+           s.marks_per_correct, s.negative_mark
+    FROM attempts a LEFT JOIN sessions s ON s.attempt_uuid = a.attempt_uuid
+    WHERE a.id > ? {where}
+    ORDER BY a.id
+    LIMIT ?
+"""
+
+UPDATE_GRADES_SQL = """
+    UPDATE attempts SET correct_answer = ?, correct_type = ?, correct_value = ?, correct_numeric = ?,
+                        is_correct = ?, marks = ?
+    WHERE id = ?
+"""
+
+UPDATE_SESSION_MARKING_SQL = """
+    UPDATE sessions SET marks_per_correct = COALESCE(?, marks_per_correct), negative_mark = COALESCE(?, negative_mark)
+    WHERE attempt_uuid = ?
+"""
+
+# Per-attempt totals computed by SQLite from the typed columns; no re-scoring in Python.
+# score is NULL when no question has marks (no marking scheme recorded), not 0
+SUMMARY_SELECT_SQL = """
+    SELECT a.attempt_uuid, s.exam_type, s.pdf_hash, COALESCE(s.created_at, MIN(a.timestamp)) AS created_at,
+           COUNT(*) AS num_questions,
+           SUM(a.selected_value IS NOT NULL) AS attempted,
+           SUM(a.is_correct = 1) AS correct,
+           SUM(a.is_correct = 0) AS incorrect,
+           SUM(a.marks) AS score,
+           TOTAL(a.time_spent_sec) AS time_spent_sec,
+           TOTAL(a.hint_count) AS hints
+    FROM attempts a LEFT JOIN sessions s ON s.attempt_uuid = a.attempt_uuid
+"""
+
+ATTEMPT_SUMMARY_SQL = SUMMARY_SELECT_SQL + """
+    WHERE a.attempt_uuid = ?
+    GROUP BY a.attempt_uuid
+"""
+
+HISTORY_SUMMARY_SQL = SUMMARY_SELECT_SQL + """
+    GROUP BY a.attempt_uuid
+    ORDER BY created_at, MIN(a.id)
+"""
+
+# Per-type accuracy as ResultStats.by_type counts it: grouped by the answer's type (the key's when
+# skipped, which is what answer_type stores) and as a percent of attempted questions
+TYPE_ACCURACY_SQL = """
+    SELECT COALESCE(answer_type, correct_type) AS answer_type,
+           COUNT(*) AS questions,
+           SUM(selected_value IS NOT NULL) AS attempted,
+           SUM(is_correct = 1) AS correct,
+           COALESCE(100.0 * SUM(is_correct = 1) / NULLIF(SUM(selected_value IS NOT NULL), 0), 0.0) AS accuracy,
+           AVG(time_spent_sec) AS avg_time_sec
+    FROM attempts
+    WHERE COALESCE(answer_type, correct_type) IS NOT NULL
+    GROUP BY 1
+    ORDER BY 1
+"""
+
 def ensure_db_path():
     data_dir = os.path.dirname(DB_FILE)
     if not os.path.exists(data_dir):
         os.makedirs(data_dir, exist_ok=True)
 
+def _open_conn(path):
+    ensure_db_path()
+    conn = sqlite3.connect(path, timeout=30, cached_statements=CACHED_STATEMENTS)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
 @contextmanager
 def get_conn(path=None):
-    ensure_db_path()
-    conn = sqlite3.connect(path or DB_FILE, timeout=30)
+    """
+    Yield this thread's long-lived connection to `path` (opened and tuned on first use).
+    Connections are not closed on exit; an open transaction is rolled back if the block raises.
+    """
+    path = path or DB_FILE
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = _open_conn(path)
     try:
         yield conn
-    finally:
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+def close_conn(path=None):
+    """Close this thread's connection to `path`, if one is open."""
+    conns = getattr(_local, "conns", None) or {}
+    conn = conns.pop(path or DB_FILE, None)
+    if conn is not None:
+        conn.close()
+
+def close_all_conns():
+    """Close every connection opened by this thread."""
+    conns = getattr(_local, "conns", None) or {}
+    while conns:
+        _path, conn = conns.popitem()
         conn.close()
 
+def _migrate_v1(conn):
+    # Original schema: one row per question of an attempt
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        attempt_uuid TEXT,
+        question_index INTEGER,
+        selected_answer INTEGER,
+        correct_answer INTEGER,
+        time_spent_sec INTEGER,
+        hint_count INTEGER DEFAULT 0,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+def _migrate_v2(conn):
+    # Index attempt lookups and history scans; per-attempt metadata gets its own table
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attempts_uuid_question ON attempts (attempt_uuid, question_index)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attempts_timestamp ON attempts (timestamp)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sessions (
+        attempt_uuid TEXT PRIMARY KEY,
+        exam_type TEXT,
+        pdf_hash TEXT,
+        num_questions INTEGER,
+        time_limit_min INTEGER,
+        marks_per_correct REAL,
+        negative_mark REAL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_pdf_hash ON sessions (pdf_hash)")
+    # Attempts logged before this version get a session row; their exam settings were never recorded
+    conn.execute("""
+    INSERT OR IGNORE INTO sessions (attempt_uuid, num_questions, created_at)
+    SELECT attempt_uuid, COUNT(*), MIN(timestamp) FROM attempts
+    WHERE attempt_uuid IS NOT NULL
+    GROUP BY attempt_uuid
+    """)
+
+def _migrate_v3(conn):
+    # Typed answer columns: every answer type is stored, not just MCQ indices. selected_answer and
+    # correct_answer stay as the MCQ index for older readers.
+    for column, decl in (("answer_type", "TEXT"), ("selected_value", "TEXT"), ("selected_numeric", "REAL"),
+                         ("correct_type", "TEXT"), ("correct_value", "TEXT"), ("correct_numeric", "REAL"),
+                         ("is_correct", "INTEGER"), ("marks", "REAL")):
+        conn.execute(f"ALTER TABLE attempts ADD COLUMN {column} {decl}")
+    # Backfill from the legacy columns; marks only where the session recorded a marking scheme
+    rows = conn.execute("""
+    SELECT a.id, a.selected_answer, a.correct_answer, s.marks_per_correct, s.negative_mark
+    FROM attempts a LEFT JOIN sessions s ON s.attempt_uuid = a.attempt_uuid
+    """).fetchall()
+    updates = []
+    for row_id, selected, correct, marks_per_correct, negative_mark in rows:
+        sel_type, sel_value, sel_num = encode_answer(selected)
+        cor_type, cor_value, cor_num = encode_answer(correct)
+        is_correct, marks = grade_answer(selected, correct, marks_per_correct, negative_mark)
+        updates.append((sel_type or cor_type, sel_value, sel_num, cor_type, cor_value, cor_num,
+                        _bool_param(is_correct), marks, row_id))
+    conn.executemany("""
+    UPDATE attempts SET answer_type = ?, selected_value = ?, selected_numeric = ?,
+                        correct_type = ?, correct_value = ?, correct_numeric = ?, is_correct = ?, marks = ?
+    WHERE id = ?
+    """, updates)
+
+# Applied in order; PRAGMA user_version records how many of them a database file has seen
+MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3]
+SCHEMA_VERSION = len(MIGRATIONS)
+
 def init_db(path=None):
     """
-    Create required tables if they do not exist.
+    Create required tables if they do not exist, and migrate older database files in place.
     """
     with get_conn(path) as conn:
-        cur = conn.cursor()
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS attempts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            attempt_uuid TEXT,
-            question_index INTEGER,
-            selected_answer INTEGER,
-            correct_answer INTEGER,
-            time_spent_sec INTEGER,
-            hint_count INTEGER DEFAULT 0,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        conn.commit()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            # Each step commits together with its version bump, so a failed step is retried next start
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+
+def _bool_param(value):
+    return None if value is None else int(bool(value))
+
+def _mcq_index(answer_type, value):
+    # Legacy INTEGER columns keep holding the MCQ index (0..3)
+    return MCQ_MAP_LETTER_TO_IDX[value] if answer_type == "mcq" and value is not None else None
+
+def _attempt_params(row, marks_per_correct=None, negative_mark=None):
+    # Answers may be {"type", "value"} records or legacy MCQ indices; both are encoded into typed columns
+    selected = row.get("selected_answer")
+    correct = row.get("correct_answer")
+    sel_type, sel_value, sel_num = encode_answer(selected)
+    cor_type, cor_value, cor_num = encode_answer(correct)
+    is_correct, marks = grade_answer(selected, correct, marks_per_correct, negative_mark)
+    return (row["attempt_uuid"], row["question_index"], _mcq_index(sel_type, sel_value),
+            _mcq_index(cor_type, cor_value), row.get("time_spent_sec"), row.get("hint_count", 0) or 0,
+            sel_type or cor_type, sel_value, sel_num, cor_type, cor_value, cor_num,
+            _bool_param(is_correct), marks)
 
 def log_attempt(attempt_uuid, question_index, selected_answer, correct_answer,
                 time_spent_sec, hint_count=0, path=None):
     """
     Insert a row recording a question attempt.
-    selected_answer/correct_answer: 0..3 for A..D, or None.
+    selected_answer/correct_answer: {"type": "mcq"|"numeric"|"text", "value": ...}, 0..3 for A..D, or None.
     """
+    params = _attempt_params(dict(attempt_uuid=attempt_uuid, question_index=question_index,
+                                  selected_answer=selected_answer, correct_answer=correct_answer,
+                                  time_spent_sec=time_spent_sec, hint_count=hint_count))
     with get_conn(path) as conn:
         cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO attempts (attempt_uuid, question_index, selected_answer, correct_answer, time_spent_sec, hint_count)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (attempt_uuid, question_index, selected_answer, correct_answer, time_spent_sec, hint_count))
+        cur.execute(INSERT_ATTEMPT_SQL, params)
         conn.commit()
         return cur.lastrowid
 
+def _session_params(session):
+    return (session["attempt_uuid"], session.get("exam_type"), session.get("pdf_hash"),
+            session.get("num_questions"), session.get("time_limit_min"),
+            session.get("marks_per_correct"), session.get("negative_mark"))
+
+def log_session(attempt_uuid, exam_type=None, pdf_hash=None, num_questions=None, time_limit_min=None,
+                marks_per_correct=None, negative_mark=None, path=None):
+    """
+    Insert or replace the metadata row of an attempt (exam settings and the paper's content hash).
+    """
+    session = dict(attempt_uuid=attempt_uuid, exam_type=exam_type, pdf_hash=pdf_hash,
+                   num_questions=num_questions, time_limit_min=time_limit_min,
+                   marks_per_correct=marks_per_correct, negative_mark=negative_mark)
+    with get_conn(path) as conn:
+        conn.execute(UPSERT_SESSION_SQL, _session_params(session))
+        conn.commit()
+
+def get_session(attempt_uuid, path=None):
+    """
+    Return the session row for attempt_uuid as a dict, or None.
+    """
+    with get_conn(path) as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        row = cur.execute(SELECT_SESSION_SQL, (attempt_uuid,)).fetchone()
+        return dict(row) if row is not None else None
+
+def log_attempts(rows, path=None, session=None):
+    """
+    Insert many attempt rows in a single transaction.
+    rows: iterable of dicts with the same keys as log_attempt's arguments
+    (attempt_uuid, question_index, selected_answer, correct_answer, time_spent_sec, hint_count).
+    session: optional dict of log_session's fields, written in the same transaction; its marking
+    scheme fills the per-question marks column.
+    Returns the number of rows written.
+    """
+    marks_per_correct = session.get("marks_per_correct") if session else None
+    negative_mark = session.get("negative_mark") if session else None
+    params = [_attempt_params(r, marks_per_correct, negative_mark) for r in rows]
+    if not params and session is None:
+        return 0
+    with get_conn(path) as conn:
+        with conn:  # commits once, or rolls back the whole attempt on error
+            if session is not None:
+                conn.execute(UPSERT_SESSION_SQL, _session_params(session))
+            conn.executemany(INSERT_ATTEMPT_SQL, params)
+        return len(params)
+
 def get_attempts_for_attempt_id(attempt_uuid, path=None):
     """
     Return list of dict rows for a given attempt_uuid ordered by question_index.
     """
     with get_conn(path) as conn:
-        conn.row_factory = sqlite3.Row
+        # Row factory on the cursor only; the connection is shared
         cur = conn.cursor()
-        cur.execute("""
-            SELECT question_index, selected_answer, correct_answer, time_spent_sec, hint_count, timestamp
-            FROM attempts
-            WHERE attempt_uuid = ?
-            ORDER BY question_index
-        """, (attempt_uuid,))
+        cur.row_factory = sqlite3.Row
+        cur.execute(SELECT_ATTEMPTS_SQL, (attempt_uuid,))
         rows = cur.fetchall()
         return [dict(r) for r in rows]
 
 def clear_attempts_for_attempt_id(attempt_uuid, path=None):
     with get_conn(path) as conn:
         cur = conn.cursor()
-        cur.execute("DELETE FROM attempts WHERE attempt_uuid = ?", (attempt_uuid,))
-        conn.commit()
\ No newline at end of file
+        cur.execute(DELETE_ATTEMPTS_SQL, (attempt_uuid,))
+        cur.execute(DELETE_SESSION_SQL, (attempt_uuid,))
+        conn.commit()
+
+def get_attempt_summary(attempt_uuid, path=None):
+    """
+    Return totals for one attempt (attempted, correct, incorrect, score, time_spent_sec, hints) as a dict,
+    or None if nothing was logged for it.
+    """
+    with get_conn(path) as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        row = cur.execute(ATTEMPT_SUMMARY_SQL, (attempt_uuid,)).fetchone()
+        return dict(row) if row is not None else None
+
+def get_history_summary(path=None):
+    """
+    Return per-attempt totals for every logged attempt, oldest first.
+    """
+    with get_conn(path) as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return [dict(r) for r in cur.execute(HISTORY_SUMMARY_SQL)]
+
+def get_accuracy_by_type(path=None):
+    """
+    Return history-wide accuracy (percent of attempted questions answered correctly) and
+    average time per answer type (mcq / numeric / text).
+    """
+    with get_conn(path) as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return [dict(r) for r in cur.execute(TYPE_ACCURACY_SQL)]
+
+def iter_attempt_chunks(chunk_size=50000, attempt_uuids=None, pdf_hash=None, path=None):
+    """
+    Yield lists of grading rows (id, attempt_uuid, question_index, answer_type, selected_value,
+    selected_numeric, marks_per_correct, negative_mark), at most chunk_size at a time, in id order.
+    Filter by attempt_uuids or by the paper's pdf_hash; with neither, every attempt is scanned.
+    Each chunk is a separate query, so updates may be written between chunks.
+    """
+    where, params = "", []
+    if attempt_uuids:
+        where = "AND a.attempt_uuid IN (%s)" % ",".join("?" * len(attempt_uuids))
+        params = list(attempt_uuids)
+    elif pdf_hash:
+        where = "AND s.pdf_hash = ?"
+        params = [pdf_hash]
+    sql = SELECT_GRADING_CHUNK_SQL.format(where=where)
+    last_id = 0
+    while True:
+        with get_conn(path) as conn:
+            rows = conn.execute(sql, [last_id] + params + [chunk_size]).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+def update_attempt_grades(updates, path=None):
+    """
+    Write regraded rows in one transaction.
+    updates: iterable of (correct_answer, correct_type, correct_value, correct_numeric, is_correct, marks, id).
+    Returns the number of rows updated.
+    """
+    updates = list(updates)
+    if not updates:
+        return 0
+    with get_conn(path) as conn:
+        with conn:
+            conn.executemany(UPDATE_GRADES_SQL, updates)
+        return len(updates)
+
+def update_session_marking(attempt_uuids, marks_per_correct, negative_mark, path=None):
+    """Record a new marking scheme on the given attempts' sessions; a None value keeps the current one."""
+    with get_conn(path) as conn:
+        with conn:
+            conn.executemany(UPDATE_SESSION_MARKING_SQL,
+                             [(marks_per_correct, negative_mark, u) for u in attempt_uuids])
@@ -1,16 +1,38 @@
 import sys
+import time
+
+# `python src/main.py --profile-startup`: time every import and the first window, print a report and exit
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+if PROFILE_STARTUP:
+    sys.argv.remove("--profile-startup")
+    from utils.startup_profile import ImportProfiler
+    profiler = ImportProfiler()
+    profiler.install()
+
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from ui.main_window import MainWindow
 from db.storage import init_db
 from dotenv import load_dotenv  # add
 
 def main():
+    milestones = [("imports done", time.perf_counter())]
     load_dotenv()  # load .env so OPENAI_API_KEY becomes available
     init_db()  # ensure DB/tables exist
+    milestones.append(("database ready", time.perf_counter()))
     app = QApplication(sys.argv)
     main_window = MainWindow()
+    milestones.append(("main window built", time.perf_counter()))
     main_window.show()
+    if PROFILE_STARTUP:
+        def finish():
+            # Runs once the event loop has processed the show/paint events queued above
+            milestones.append(("first window painted", time.perf_counter()))
+            profiler.uninstall()
+            profiler.report(milestones)
+            app.quit()
+        QTimer.singleShot(0, finish)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,13 +6,72 @@ import openai
 from PIL import Image
 import base64
 import io
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-def extract_answers_from_pdf(pdf_path, api_key=None, model="gpt-4o", num_questions=None, max_chars=30000, question_types=None):
+# Allow running as a file (python src/scripts/fetch_answers_openai.py) as well as with -m from src/
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fitz_lock import FITZ_LOCK
+from utils.openai_cache import chat_completion_text
+
+# Vision requests in flight at once while looking for answer key pages
+PAGE_CHECK_CONCURRENCY = 8
+
+
+def _page_png_base64(doc, page_num):
+    # Only the rasterization holds the MuPDF lock; PNG encoding runs outside it
+    with FITZ_LOCK:
+        pix = doc.load_page(page_num).get_pixmap(dpi=150)
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+    # Encode image to base64
+    buffered = io.BytesIO()
+    img.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+def _check_page(model, page_num, img_base64):
+    """Ask whether a page holds an answer key; returns the model's reply if so, else None."""
+    try:
+        result = chat_completion_text(
+            model,
+            [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": f"""This is page {page_num+1} of a PDF. Does this page contain an answer key?
+If yes, reply with 'Yes' followed by the extracted answer key content (question numbers and answers).
+If not, reply with 'No'."""
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": f"data:image/png;base64,{img_base64}"}
+                        }
+                    ]
+                }
+            ],
+            max_tokens=1500,
+            temperature=0.0
+        ).strip()
+    except Exception:
+        # Continue if a page fails
+        return None
+    return result if result.lower().startswith("yes") else None
+
+
+def extract_answers_from_pdf(pdf_path, api_key=None, model="gpt-4o", num_questions=None, max_chars=30000, question_types=None,
+                             max_concurrency=PAGE_CHECK_CONCURRENCY):
     """
     Extracts the answer list from an answer-key PDF using OpenAI vision API.
     Returns a structured list like:
       [{"type":"mcq","value":0..3}, {"type":"numeric","value":"3.14"}, {"type":"text","value":"SODIUM"}, ...]
     - question_types: list of "mcq" | "numeric" | "text" of length num_questions (defaults to mcq for all)
+    - max_concurrency: page checks sent to the API at once
     """
     if api_key:
         openai.api_key = api_key
@@ -37,54 +96,31 @@ def extract_answers_from_pdf(pdf_path, api_key=None, model="gpt-4o", num_questio
             else:
                 question_types = question_types[:num_questions]
 
-    # Load PDF and convert all pages to images
-    doc = fitz.open(pdf_path)
+    # Step 1: Identify answer key pages using vision. Pages are rendered here, one at a time and
+    # under FITZ_LOCK, while earlier pages are already being checked on the pool; results are
+    # collected in page order
+    with FITZ_LOCK:
+        doc = fitz.open(pdf_path)
+        page_count = len(doc)
     answer_key_pages = []
-
-    # Step 1: Identify answer key pages using vision
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        pix = page.get_pixmap(dpi=150)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-        # Encode image to base64
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
-        # Ask if this is an answer key page
-        try:
-            check = openai.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"""This is page {page_num+1} of a PDF. Does this page contain an answer key?
-If yes, reply with 'Yes' followed by the extracted answer key content (question numbers and answers).
-If not, reply with 'No'."""
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{img_base64}"}
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1500,
-                temperature=0.0
-            )
-
-            result = check.choices[0].message.content.strip()
-            if result.lower().startswith("yes"):
+    workers = max(1, max_concurrency)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for page_num in range(page_count):
+            img_base64 = _page_png_base64(doc, page_num)
+            in_flight.append(pool.submit(_check_page, model, page_num, img_base64))
+            # Keep rendered-but-unsent pages bounded
+            if len(in_flight) >= 2 * workers:
+                result = in_flight.popleft().result()
+                if result is not None:
+                    answer_key_pages.append(result)
+        while in_flight:
+            result = in_flight.popleft().result()
+            if result is not None:
                 answer_key_pages.append(result)
-        except Exception as e:
-            # Continue if a page fails
-            continue
 
-    doc.close()
+    with FITZ_LOCK:
+        doc.close()
 
     if not answer_key_pages:
         raise ValueError("No answer key pages detected in the PDF.")
@@ -110,9 +146,9 @@ Rules:
 Return ONLY the JSON array, no explanations."""
 
     try:
-        step2 = openai.chat.completions.create(
-            model=model,
-            messages=[
+        list_text = chat_completion_text(
+            model,
+            [
                 {
                     "role": "user",
                     "content": prompt
@@ -120,8 +156,7 @@ Return ONLY the JSON array, no explanations."""
             ],
             max_tokens=2000,
             temperature=0.0
-        )
-        list_text = step2.choices[0].message.content.strip()
+        ).strip()
     except Exception as e:
         raise ValueError(f"Failed to convert answer key to structured format: {e}")
 
@@ -202,7 +237,7 @@ Return ONLY the JSON array, no explanations."""
 
 # CLI for testing
 if __name__ == "__main__":
-    import sys, json
+    import json
     if len(sys.argv) < 2:
         raise SystemExit("Usage: python fetch_answers_openai.py /path/to/file.pdf [num_questions]")
     pdf = sys.argv[1]
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Allow running as a file (python src/scripts/regrade_attempts.py) as well as with -m from src/
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import storage
+from utils.answers import encode_answer, normalize_answer_item
+from utils.file_utils import file_digest
+from utils.scoring import AnswerColumns, grade
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _key_columns(key_items):
+    # Stored correct-answer columns for each question of the key, in UPDATE_GRADES_SQL order
+    out = []
+    for item in key_items:
+        a = normalize_answer_item(item)
+        mcq = a["value"] if a is not None and a["type"] == "mcq" else None
+        out.append((mcq,) + encode_answer(item))
+    return out
+
+
+def grade_chunk(rows, key_items, marks_per_correct=None, negative_mark=None):
+    """
+    Grade one chunk of storage.iter_attempt_chunks rows against `key_items` (one answer record per
+    question). The marking scheme defaults to each attempt's session. Returns update tuples for
+    storage.update_attempt_grades. Runs in worker processes, so everything here is picklable.
+    """
+    n = len(rows)
+    qidx = np.fromiter((r[2] for r in rows), dtype=np.int64, count=n)
+    size = max(len(key_items), int(qidx.max()) + 1 if n else 0)
+    padded = list(key_items) + [None] * (size - len(key_items))
+
+    user = AnswerColumns.from_stored([r[3] for r in rows], [r[4] for r in rows], [r[5] for r in rows])
+    key = AnswerColumns.from_items(padded)
+    key = AnswerColumns(key.types[qidx], key.mcq[qidx], key.numeric[qidx], key.text[qidx])
+    attempted, correct, has_key = grade(user, key)
+    judged = attempted & has_key
+
+    def scheme(override, column):
+        if override is not None:
+            return np.full(n, float(override))
+        return np.array([np.nan if r[column] is None else r[column] for r in rows], dtype=np.float64)
+
+    mpc = scheme(marks_per_correct, 6)
+    neg = scheme(negative_mark, 7)
+    marks = np.where(correct, mpc, np.where(judged, np.nan_to_num(neg), 0.0))
+    # No marking scheme recorded for the attempt: marks stay unknown
+    marks_known = ~np.isnan(mpc)
+
+    key_cols = _key_columns(padded)
+    return [
+        key_cols[q] + (int(c) if j else None, m if k else None, row[0])
+        for row, q, c, j, m, k in zip(rows, qidx.tolist(), correct.tolist(), judged.tolist(),
+                                      marks.tolist(), marks_known.tolist())
+    ]
+
+
+def regrade(key_items, attempt_uuids=None, pdf_hash=None, marks_per_correct=None, negative_mark=None,
+            chunk_size=DEFAULT_CHUNK_SIZE, workers=None, path=None):
+    """
+    Regrade stored attempts against a new key (and optionally a new marking scheme).
+    Rows are streamed in chunks of `chunk_size`; chunks are graded on a process pool with at most
+    two chunks per worker in flight, and each graded chunk is written in one transaction.
+    Returns (rows updated, attempts touched).
+    """
+    storage.init_db(path)
+    workers = workers or os.cpu_count() or 1
+    chunks = storage.iter_attempt_chunks(chunk_size, attempt_uuids, pdf_hash, path)
+    touched = set()
+    total = 0
+
+    def write(chunk, updates):
+        nonlocal total
+        total += storage.update_attempt_grades(updates, path)
+        touched.update(r[1] for r in chunk)
+
+    first = next(chunks, None)
+    if first is None:
+        return 0, 0
+    if workers == 1 or len(first) < chunk_size:
+        # A single chunk (or one worker) is not worth starting a pool for
+        for chunk in _chain(first, chunks):
+            write(chunk, grade_chunk(chunk, key_items, marks_per_correct, negative_mark))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for chunk in _chain(first, chunks):
+                in_flight.append((chunk, pool.submit(grade_chunk, chunk, key_items, marks_per_correct, negative_mark)))
+                if len(in_flight) >= 2 * workers:
+                    done_chunk, future = in_flight.popleft()
+                    write(done_chunk, future.result())
+            while in_flight:
+                done_chunk, future = in_flight.popleft()
+                write(done_chunk, future.result())
+
+    if marks_per_correct is not None or negative_mark is not None:
+        storage.update_session_marking(touched, marks_per_correct, negative_mark, path)
+    return total, len(touched)
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regrade stored attempts against a corrected answer key.")
+    parser.add_argument("key", help="JSON file with the answer key: a list of {\"type\", \"value\"} records "
+                                    "(as written by fetch_answers_openai.py), MCQ indices or letters")
+    parser.add_argument("--attempt", action="append", dest="attempts", metavar="UUID",
+                        help="attempt to regrade (repeatable)")
+    parser.add_argument("--pdf", help="regrade every attempt taken on this question paper")
+    parser.add_argument("--pdf-hash", help="regrade every attempt whose paper has this SHA-256")
+    parser.add_argument("--all", action="store_true", help="regrade every stored attempt")
+    parser.add_argument("--marks", type=float, help="marks per correct answer (default: each attempt's own)")
+    parser.add_argument("--negative", type=float, help="marks per wrong answer, e.g. -1 (default: each attempt's own)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="grading processes (default: CPU count)")
+    parser.add_argument("--db", default=None, help="database file (default: the app's)")
+    args = parser.parse_args(argv)
+
+    pdf_hash = file_digest(args.pdf) if args.pdf else args.pdf_hash
+    if not (args.attempts or pdf_hash or args.all):
+        parser.error("choose attempts with --attempt, --pdf, --pdf-hash or --all")
+    with open(args.key, "r", encoding="utf-8") as f:
+        key_items = json.load(f)
+
+    start = time.perf_counter()
+    rows, attempts = regrade(key_items, attempt_uuids=args.attempts, pdf_hash=pdf_hash,
+                             marks_per_correct=args.marks, negative_mark=args.negative,
+                             chunk_size=args.chunk_size, workers=args.workers, path=args.db)
+    elapsed = time.perf_counter() - start
+    sys.stdout.write(f"Regraded {rows} rows across {attempts} attempts in {elapsed:.2f}s\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
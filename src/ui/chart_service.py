@@ -0,0 +1,190 @@
+from collections import OrderedDict
+import math
+import queue
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from ui.rendered_image import RenderedImage
+
+# Memory budget for finished charts (bytes); keys are the plotted data, so reopening a window
+# with the same results never redraws
+CHART_CACHE_BYTES = 32 * 1024 * 1024
+
+RESULTS_DONUT = "results_donut"
+TOPIC_PIE = "topic_pie"
+
+_service = None
+
+
+def _draw_results_donut(fig, data):
+    # data: ((count, color), ...) for correct / wrong / not attempted
+    counts = [c for c, _color in data]
+    colors = [color for _c, color in data]
+    ax = fig.add_subplot(111)
+    total = sum(counts) if sum(counts) > 0 else 1
+    wedges, _ = ax.pie(
+        counts,
+        colors=colors,
+        startangle=90,
+        wedgeprops=dict(width=0.35, edgecolor="white")
+    )
+    ax.set(aspect="equal")
+    for w, c in zip(wedges, counts):
+        if total == 0 or c == 0:
+            continue
+        ang = (w.theta2 + w.theta1) / 2.0
+        x, y = math.cos(math.radians(ang)), math.sin(math.radians(ang))
+        pct = 100.0 * c / total
+        ax.text(x*0.8, y*0.8, f"{pct:.0f}%", ha="center", va="center", fontsize=9, color="#333")
+
+
+def _draw_topic_pie(fig, data):
+    # data: ((name, count, color), ...)
+    ax = fig.add_subplot(111)
+    wedges, texts, autotexts = ax.pie(
+        [count for _name, count, _color in data],
+        labels=[name for name, _count, _color in data],
+        colors=[color for _name, _count, color in data],
+        autopct="%1.1f%%",
+        startangle=90
+    )
+    ax.set_aspect("equal")
+    for autotext in autotexts:
+        autotext.set_color("white")
+        autotext.set_fontsize(11)
+        autotext.set_weight("bold")
+    for text in texts:
+        text.set_fontsize(10)
+        text.set_weight("bold")
+
+
+# kind -> (draw function, figure size in inches, dpi)
+CHARTS = {
+    RESULTS_DONUT: (_draw_results_donut, (3.0, 3.0), 140),
+    TOPIC_PIE: (_draw_topic_pie, (5.5, 5.5), 100),
+}
+
+
+def render_chart(kind, data) -> RenderedImage:
+    """Draw a chart with the Agg canvas and wrap its RGBA buffer (no PNG encode/decode)."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    draw, size, dpi = CHARTS[kind]
+    fig = Figure(figsize=size, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    # Transparent background, as savefig(transparent=True) gave
+    fig.patch.set_alpha(0.0)
+    draw(fig, data)
+    for ax in fig.axes:
+        ax.patch.set_alpha(0.0)
+    fig.tight_layout()
+    canvas.draw()
+    buf = canvas.buffer_rgba()
+    height, width = buf.shape[:2]
+    image = QImage(buf, width, height, width * 4, QImage.Format_RGBA8888)
+    # The canvas owns the buffer; keep it alive until the GUI thread has made a pixmap
+    return RenderedImage(image, canvas)
+
+
+class _ChartWorker(QThread):
+    """Single worker thread: matplotlib figures are drawn one at a time, off the GUI thread."""
+    rendered = pyqtSignal(object, object, str)  # key, RenderedImage or None, error message
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        while True:
+            key = self.jobs.get()
+            if key is None:
+                break
+            kind, data = key
+            try:
+                self.rendered.emit(key, render_chart(kind, data), "")
+            except ImportError:
+                self.rendered.emit(key, None, "Install matplotlib to see the chart.")
+            except Exception:
+                self.rendered.emit(key, None, "Chart rendering failed.")
+
+
+class ChartService(QObject):
+    """
+    Renders charts in a worker thread and caches the resulting pixmaps by (kind, data).
+    request() calls back on the GUI thread with (QPixmap, "") or (None, error message).
+    """
+
+    def __init__(self, parent=None, max_bytes=CHART_CACHE_BYTES):
+        super().__init__(parent)
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._waiting = {}  # key -> callbacks
+        self._jobs = queue.Queue()
+        self._worker = _ChartWorker(self._jobs)
+        self._worker.rendered.connect(self._on_rendered)
+        self._worker.start()
+        self._closed = False
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def cached(self, kind, data):
+        """Return the cached pixmap for (kind, data), or None."""
+        key = (kind, data)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+        return pixmap
+
+    def request(self, kind, data, callback):
+        """
+        Deliver the chart for `data` (a hashable tuple, see CHARTS) to `callback`.
+        Cached charts are delivered immediately; identical pending requests share one render.
+        """
+        pixmap = self.cached(kind, data)
+        if pixmap is not None:
+            callback(pixmap, "")
+            return
+        key = (kind, data)
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return
+        self._waiting[key] = [callback]
+        if not self._closed:
+            self._jobs.put(key)
+
+    def _on_rendered(self, key, image, error):
+        pixmap = None
+        if image is not None:
+            pixmap = image.to_pixmap()
+            self._store(key, pixmap)
+        for callback in self._waiting.pop(key, []):
+            try:
+                callback(pixmap, error)
+            except RuntimeError:
+                # The requesting widget was closed before the chart arrived
+                pass
+
+    def _store(self, key, pixmap: QPixmap):
+        cost = pixmap.width() * pixmap.height() * 4
+        self._cache[key] = pixmap
+        self._bytes += cost
+        while self._bytes > self.max_bytes and len(self._cache) > 1:
+            _key, evicted = self._cache.popitem(last=False)
+            self._bytes -= evicted.width() * evicted.height() * 4
+
+    def shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._jobs.put(None)
+        self._worker.wait()
+
+
+def chart_service() -> ChartService:
+    """Shared app-wide chart service."""
+    global _service
+    if _service is None:
+        _service = ChartService()
+    return _service
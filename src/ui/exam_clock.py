@@ -0,0 +1,119 @@
+import math
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# How often the shared driver samples the clocks; a displayed second is at most this late
+TICK_MS = 250
+
+_driver = None
+
+
+def format_clock(seconds):
+    """Whole seconds as hh:mm:ss."""
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class TickDriver(QObject):
+    """
+    One app-wide timer that samples every running ExamClock. It only runs while a clock is
+    registered, and all clocks are checked against the same monotonic reading.
+    """
+
+    def __init__(self, parent=None, interval_ms=TICK_MS):
+        super().__init__(parent)
+        self._clocks = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def add(self, clock):
+        if clock not in self._clocks:
+            self._clocks.append(clock)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def remove(self, clock):
+        if clock in self._clocks:
+            self._clocks.remove(clock)
+        if not self._clocks:
+            self._timer.stop()
+
+    @property
+    def active(self):
+        return self._timer.isActive()
+
+    def _on_timeout(self):
+        now = time.monotonic()
+        for clock in list(self._clocks):
+            clock.tick(now)
+
+
+def tick_driver() -> TickDriver:
+    """Shared app-wide tick driver."""
+    global _driver
+    if _driver is None:
+        _driver = TickDriver()
+    return _driver
+
+
+class ExamClock(QObject):
+    """
+    Countdown measured against a monotonic deadline, so a stalled GUI thread delays the display
+    but never the end of the exam. Emits second_changed(seconds left) only when the displayed
+    whole second changes (late ticks are coalesced into one update); at zero it stops itself.
+    """
+    second_changed = pyqtSignal(int)
+
+    def __init__(self, seconds, driver=None, parent=None):
+        super().__init__(parent)
+        self._remaining = float(seconds)  # while stopped
+        self._deadline = None  # monotonic time the exam ends, while running
+        self._shown = None
+        self._driver = driver
+
+    @property
+    def running(self):
+        return self._deadline is not None
+
+    def remaining(self, now=None):
+        """Seconds left (float, never negative)."""
+        if self._deadline is None:
+            return max(0.0, self._remaining)
+        return max(0.0, self._deadline - (time.monotonic() if now is None else now))
+
+    def seconds_left(self, now=None):
+        """Whole seconds left, rounded up: the clock reads 00:00:00 only once time is up."""
+        return math.ceil(self.remaining(now))
+
+    def start(self):
+        if self._deadline is not None:
+            return
+        self._deadline = time.monotonic() + self._remaining
+        (self._driver or tick_driver()).add(self)
+
+    def stop(self):
+        """Freeze the clock at the time left now."""
+        if self._deadline is None:
+            return
+        self._remaining = self.remaining()
+        self._deadline = None
+        (self._driver or tick_driver()).remove(self)
+
+    def set_remaining(self, seconds):
+        """Reset the time left (e.g. to a resumed test's), keeping the clock running if it was."""
+        running = self.running
+        self.stop()
+        self._remaining = float(seconds)
+        self._shown = None
+        if running:
+            self.start()
+
+    def tick(self, now=None):
+        left = self.seconds_left(now)
+        if left == self._shown:
+            return
+        self._shown = left
+        if left == 0:
+            self.stop()
+        self.second_changed.emit(left)
@@ -1,6 +1,6 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 import os
-import openai
+from utils.openai_cache import chat_completion_text
 
 class HintWorker(QThread):
     """
@@ -25,7 +25,6 @@ class HintWorker(QThread):
             if not key:
                 self.error.emit("OPENAI_API_KEY not set.")
                 return
-            openai.api_key = key
 
             opts_text = ""
             if self.options:
@@ -37,20 +36,17 @@ class HintWorker(QThread):
                 f"Question:\n{self.question_text}\n\n{opts_text}\n\nHint:"
             )
 
-            resp = openai.chat.completions.create(
-                model=self.model,
-                messages=[
+            hint = chat_completion_text(
+                self.model,
+                [
                     {"role": "system", "content": "You generate short hints without revealing answers."},
                     {"role": "user", "content": prompt}
                 ],
+                api_key=key,
                 temperature=0.3,
                 max_tokens=120
             )
-
-            try:
-                hint = resp.choices[0].message.content.strip()
-            except Exception:
-                hint = str(resp)
+            hint = (hint or "").strip()
 
             if not hint:
                 self.error.emit("Empty hint from API.")
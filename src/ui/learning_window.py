@@ -9,7 +9,7 @@ from ui.hint_worker import HintWorker
 import webbrowser
 import json
 import os
-import openai
+from utils.openai_cache import chat_completion_text
 
 class QuestionContextDialog(QDialog):
     def __init__(self, parent=None, initial_question="", initial_options=""):
@@ -60,7 +60,6 @@ class StudyTopicWorker(QThread):
             if not self.api_key:
                 raise ValueError("OpenAI API key not found.")
 
-            openai.api_key = self.api_key
 
             # Step 1: Extract keywords from question
             keyword_prompt = f"""Extract 2-3 main topics/keywords from this question:
@@ -68,13 +67,13 @@ class StudyTopicWorker(QThread):
 
 Return ONLY the keywords separated by commas, no explanation."""
 
-            keyword_response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": keyword_prompt}],
+            keywords = chat_completion_text(
+                "gpt-4o",
+                [{"role": "user", "content": keyword_prompt}],
+                api_key=self.api_key,
                 max_tokens=100,
                 temperature=0.3
-            )
-            keywords = keyword_response.choices[0].message.content.strip()
+            ).strip()
 
             # Step 2: Find best study resource
             exam_context = ""
@@ -90,14 +89,13 @@ Return ONLY valid JSON (no markdown):
 
 No explanation, just JSON."""
 
-            resource_response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": resource_prompt}],
+            result_text = chat_completion_text(
+                "gpt-4o",
+                [{"role": "user", "content": resource_prompt}],
+                api_key=self.api_key,
                 max_tokens=300,
                 temperature=0.3
-            )
-            
-            result_text = resource_response.choices[0].message.content.strip()
+            ).strip()
             
             # Extract JSON
             start = result_text.find('{')
@@ -125,9 +123,9 @@ class LearningWindow(TestWindow):
     """
 
     def __init__(self, pdf_path, time_limit, num_questions, exam_type="Other",
-                 marks_per_correct=1.0, negative_mark=0.0):
+                 marks_per_correct=1.0, negative_mark=0.0, **kwargs):
         super().__init__(pdf_path, time_limit, num_questions, exam_type=exam_type,
-                         marks_per_correct=marks_per_correct, negative_mark=negative_mark)
+                         marks_per_correct=marks_per_correct, negative_mark=negative_mark, **kwargs)
         self.learning_mode = True
         self.hints_used = {}
         self.hint_limit = 6
@@ -141,6 +139,10 @@ class LearningWindow(TestWindow):
         except Exception:
             pass
 
+    def _restore_state(self, state):
+        self.hints_used = dict(state.get("hints_used", {}))
+        super()._restore_state(state)
+
     def _add_learning_controls(self):
         self.hint_button = QPushButton("Hint")
         self.hint_button.setFont(QFont("Arial", 11, QFont.Bold))
@@ -350,6 +352,7 @@ class LearningWindow(TestWindow):
                 self._progress.close()
             idx = getattr(self, "current_question", 0)
             self.hints_used[idx] = self.hints_used.get(idx, 0) + 1
+            self.journal.record("hint", i=idx, used=self.hints_used[idx])
             # Render hint inline (HTML escaped by QTextBrowser automatically if plain)
             self._show_hint_panel(hint_text)
         finally:
@@ -2,9 +2,11 @@ from PyQt5.QtWidgets import (
     QMainWindow, QPushButton, QFileDialog, QLabel, QVBoxLayout, QWidget, QHBoxLayout, QFrame,
     QInputDialog, QMessageBox, QDialog, QFormLayout, QSpinBox, QDoubleSpinBox, QDialogButtonBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QIcon
+import os
 from ui.test_window import TestWindow
+from db.journal import replay_journal, unfinished_journals
 
 class ExamConfigDialog(QDialog):
     def __init__(self, exam_type, def_q, def_t, def_marks, def_neg, parent=None):
@@ -66,6 +68,8 @@ class MainWindow(QMainWindow):
         self.uploaded_pdf_path = None  # Store uploaded PDF path
 
         self.initUI()
+        # Offer to resume a test that was interrupted by a crash or an early close
+        QTimer.singleShot(0, self.offer_resume)
 
     def initUI(self):
         # Set a modern color scheme
@@ -152,6 +156,38 @@ class MainWindow(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
+    def offer_resume(self):
+        paths = unfinished_journals()
+        if not paths:
+            return
+        path = paths[0]
+        state = replay_journal(path)
+        if state is None or not state.get("pdf_path") or not os.path.exists(state["pdf_path"]):
+            # Nothing usable to resume into
+            os.remove(path)
+            return
+        answered = sum(1 for a in state["answers"] if a is not None)
+        minutes_left = state["time_left_sec"] // 60
+        reply = QMessageBox.question(
+            self,
+            "Resume Test",
+            f"An unfinished {state['exam_type']} test was found "
+            f"({answered} of {state['num_questions']} answered, {minutes_left} min left).\n"
+            f"Resume it?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply != QMessageBox.Yes:
+            os.remove(path)
+            return
+        if state.get("window") == "LearningWindow":
+            from ui.learning_window import LearningWindow as window_cls
+        else:
+            window_cls = TestWindow
+        self.uploaded_pdf_path = state["pdf_path"]
+        self.test_window = window_cls.from_journal(path, state)
+        self.test_window.show()
+
     def create_card_button(self, title, description, color):
         button = QPushButton()
         button.setMinimumHeight(80)
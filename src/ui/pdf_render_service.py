@@ -0,0 +1,252 @@
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+from PyQt5.QtGui import QImage
+import itertools
+import os
+import queue
+import struct
+import threading
+import zlib
+import fitz  # PyMuPDF
+from ui.pdf_word_boxes import PageWords
+from ui.rendered_image import RenderedImage
+from utils.disk_cache import DiskCache, CACHE_ROOT
+from utils.file_utils import file_digest
+from utils.fitz_lock import FITZ_LOCK
+
+# Priority handed to pages that are on screen; prefetched pages use their distance from the view
+VISIBLE_PRIORITY = 0
+
+# Rendered pages and word boxes are kept across sessions, keyed by PDF content hash
+PAGE_CACHE_DIR = os.path.join(CACHE_ROOT, "pages")
+PAGE_CACHE_BYTES = 512 * 1024 * 1024
+_page_cache = None
+
+
+def zoom_bucket(zoom: float) -> int:
+    # Cache key for a zoom level: whole percent, which is the zoom slider's step
+    return int(round(zoom * 100))
+
+
+def page_disk_cache() -> DiskCache:
+    """Shared on-disk cache of rendered pages and word boxes."""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = DiskCache(PAGE_CACHE_DIR, PAGE_CACHE_BYTES)
+    return _page_cache
+
+
+def _image_from_fitz(pix) -> RenderedImage:
+    # samples_mv is a view of MuPDF's own buffer; the fitz.Pixmap is the only allocation
+    fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+    return RenderedImage(QImage(pix.samples_mv, pix.width, pix.height, pix.stride, fmt), pix)
+
+
+def _encode_pixmap(pix) -> bytes:
+    header = struct.pack("<IIIB", pix.width, pix.height, pix.stride, 1 if pix.alpha else 0)
+    return header + zlib.compress(pix.samples_mv, 1)
+
+
+def _decode_image(data: bytes) -> RenderedImage:
+    width, height, stride, alpha = struct.unpack_from("<IIIB", data)
+    samples = zlib.decompress(memoryview(data)[struct.calcsize("<IIIB"):])
+    fmt = QImage.Format_RGBA8888 if alpha else QImage.Format_RGB888
+    return RenderedImage(QImage(samples, width, height, stride, fmt), samples)
+
+
+class _RenderWorker(QThread):
+    """
+    The service's render thread, owning its own fitz.Document handle.
+    Pulls jobs from the service queue until it receives a shutdown sentinel.
+    """
+    rendered = pyqtSignal(object, float, int, object, object)  # key, zoom, generation, RenderedImage, PageWords
+
+    def __init__(self, service, pdf_path):
+        super().__init__()
+        self.service = service
+        self.pdf_path = pdf_path
+
+    def run(self):
+        with FITZ_LOCK:
+            doc = fitz.open(self.pdf_path)
+        try:
+            while True:
+                job = self.service._next_job()
+                if job is None:
+                    break
+                key, zoom, generation, with_words, tile_size = job
+                page_index, tile = key
+                if tile is None:
+                    img, words = self._render_page(doc, page_index, zoom, with_words)
+                else:
+                    img, words = self._render_tile(doc, page_index, zoom, tile, tile_size), None
+                self.rendered.emit(key, zoom, generation, img, words)
+        finally:
+            with FITZ_LOCK:
+                doc.close()
+
+    def _render_page(self, doc, page_index, zoom, with_words):
+        # Whole pages (and their word boxes) go through the on-disk cache
+        cache = self.service.disk_cache
+        doc_key = self.service.document_key() if cache is not None else None
+        image_key = f"{doc_key}:{page_index}:{zoom_bucket(zoom)}:image"
+        words_key = f"{doc_key}:{page_index}:words"
+
+        img = words = None
+        if cache is not None:
+            data = cache.get(image_key)
+            if data is not None:
+                img = _decode_image(data)
+            if with_words:
+                data = cache.get(words_key)
+                if data is not None:
+                    words = PageWords.from_bytes(data)
+
+        pix = raw_words = None
+        if img is None or (with_words and words is None):
+            with FITZ_LOCK:
+                page = doc.load_page(page_index)
+                if img is None:
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                if with_words and words is None:
+                    raw_words = page.get_text("words", sort=True) or []
+        if pix is not None:
+            img = _image_from_fitz(pix)
+            if cache is not None:
+                cache.put(image_key, _encode_pixmap(pix))
+        if raw_words is not None:
+            words = PageWords(raw_words)
+            if cache is not None:
+                cache.put(words_key, words.to_bytes())
+        return img, words
+
+    def _render_tile(self, doc, page_index, zoom, tile, tile_size):
+        with FITZ_LOCK:
+            page = doc.load_page(page_index)
+            # Only rasterize the part of the page under this tile
+            col, row = tile
+            step = tile_size / zoom
+            clip = fitz.Rect(col * step, row * step, (col + 1) * step, (row + 1) * step)
+            clip = clip & page.rect
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+        return _image_from_fitz(pix)
+
+
+class PageRenderService(QObject):
+    """
+    Rasterizes PDF pages (or fixed-size tiles of them) on one background thread; MuPDF calls are
+    serialized by utils.fitz_lock, so more threads would not render any faster.
+    Results are delivered on the GUI thread through `page_rendered` / `tile_rendered`; jobs that
+    are cancelled (or re-requested at another zoom) before they finish are dropped.
+    """
+    page_rendered = pyqtSignal(int, float, object, object)  # page_index, zoom, RenderedImage, PageWords (or None)
+    tile_rendered = pyqtSignal(int, float, int, int, object)  # page_index, zoom, col, row, RenderedImage
+
+    def __init__(self, pdf_path, parent=None, disk_cache=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.disk_cache = disk_cache if disk_cache is not None else page_disk_cache()
+        self._doc_key = None
+        self._doc_key_lock = threading.Lock()
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # (page_index, tile) -> [generation, zoom, priority, started] for the job that is still wanted;
+        # tile is None for a whole page or (col, row)
+        self._pending = {}
+        self._generation = itertools.count(1)
+        self._closed = False
+
+        self._worker = _RenderWorker(self, pdf_path)
+        self._worker.rendered.connect(self._on_worker_rendered)
+        self._worker.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def request(self, page_index, zoom, priority=VISIBLE_PRIORITY, with_words=True):
+        """
+        Queue a render of `page_index` at `zoom`; lower priority values render first.
+        Word boxes are only extracted when `with_words` is set (the caller caches them per document).
+        """
+        self._enqueue((page_index, None), zoom, priority, with_words, 0)
+
+    def request_tile(self, page_index, zoom, col, row, tile_size, priority=VISIBLE_PRIORITY):
+        """Queue a render of the `tile_size` pixel tile at (col, row) of a page."""
+        self._enqueue((page_index, (col, row)), zoom, priority, False, tile_size)
+
+    def _enqueue(self, key, zoom, priority, with_words, tile_size):
+        if self._closed:
+            return
+        with self._lock:
+            current = self._pending.get(key)
+            if current is not None and current[1] == zoom:
+                # Same render already queued: only re-queue if it has not started and moved up
+                if current[3] or current[2] <= priority:
+                    return
+            generation = next(self._generation)
+            self._pending[key] = [generation, zoom, priority, False]
+        self._queue.put((priority, next(self._seq), (key, zoom, generation, with_words, tile_size)))
+
+    def cancel(self, page_index):
+        """Cancel the page render and any tile renders for `page_index`."""
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == page_index]:
+                del self._pending[key]
+
+    def cancel_tiles(self, page_index, keep=()):
+        """Cancel tile renders for `page_index` except the (col, row) tiles in `keep`."""
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == page_index and k[1] is not None]:
+                if key[1] not in keep:
+                    del self._pending[key]
+
+    def is_pending(self, page_index) -> bool:
+        with self._lock:
+            return (page_index, None) in self._pending
+
+    def pending_pages(self):
+        with self._lock:
+            return [k[0] for k in self._pending if k[1] is None]
+
+    def document_key(self):
+        # SHA-256 of the PDF, computed once by whichever caller (worker or GUI) needs it first
+        with self._doc_key_lock:
+            if self._doc_key is None:
+                self._doc_key = file_digest(self.pdf_path)
+            return self._doc_key
+
+    def _next_job(self):
+        # Called from the render thread; skips jobs that were cancelled or superseded
+        while True:
+            _priority, _seq, job = self._queue.get()
+            if job is None:
+                return None
+            key, _zoom, generation, _with_words, _tile_size = job
+            with self._lock:
+                current = self._pending.get(key)
+                if current is None or current[0] != generation:
+                    continue
+                current[3] = True
+            return job
+
+    def _on_worker_rendered(self, key, zoom, generation, image, words):
+        with self._lock:
+            current = self._pending.get(key)
+            if current is None or current[0] != generation:
+                return
+            del self._pending[key]
+        page_index, tile = key
+        if tile is None:
+            self.page_rendered.emit(page_index, zoom, image, words)
+        else:
+            self.tile_rendered.emit(page_index, zoom, tile[0], tile[1], image)
+
+    def shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            self._pending.clear()
+        self._queue.put((-1, next(self._seq), None))
+        self._worker.wait()
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from PyQt5.QtGui import QPixmap
+
+# Default memory budget for rendered tiles (bytes)
+DEFAULT_TILE_BUDGET = 128 * 1024 * 1024
+
+
+class TileCache:
+    """
+    LRU cache of rendered page tiles, bounded by total pixmap size.
+    Keys are (page_index, zoom, col, row).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_TILE_BUDGET):
+        self.max_bytes = max_bytes
+        self._tiles = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def __contains__(self, key):
+        return key in self._tiles
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key):
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap: QPixmap):
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self._bytes -= self._cost(old)
+        self._tiles[key] = pixmap
+        self._bytes += self._cost(pixmap)
+        # Evict least recently used tiles, but never the one just added
+        while self._bytes > self.max_bytes and len(self._tiles) > 1:
+            _key, evicted = self._tiles.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+
+    def clear(self):
+        self._tiles.clear()
+        self._bytes = 0
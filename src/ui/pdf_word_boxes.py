@@ -0,0 +1,138 @@
+from array import array
+import struct
+
+# Side of a spatial-index cell in points (about two lines of body text)
+GRID_CELL = 24.0
+
+
+class PageWords:
+    """
+    Word boxes of one PDF page, in points (zoom independent).
+    Geometry and reading-order keys live in flat typed arrays instead of one tuple per word:
+      boxes: x0, y0, x1, y1 per word
+      order: block_no, line_no, word_no per word
+    A uniform grid over the boxes lets hit-tests look only at words under the query rectangle.
+    """
+    __slots__ = ("boxes", "order", "text", "_cols", "_rows", "_cells")
+
+    def __init__(self, words):
+        # words: (x0, y0, x1, y1, word, block_no, line_no, word_no) as returned by get_text("words")
+        self.boxes = array("f")
+        self.order = array("i")
+        self.text = []
+        for (x0, y0, x1, y1, w, b, l, wn) in words:
+            self.boxes.extend((x0, y0, x1, y1))
+            self.order.extend((b, l, wn))
+            self.text.append(w)
+        self._build_grid()
+
+    def _build_grid(self):
+        # Bucket each word into every cell its box touches
+        boxes = self.boxes
+        max_x = max((boxes[j] for j in range(2, len(boxes), 4)), default=0.0)
+        max_y = max((boxes[j] for j in range(3, len(boxes), 4)), default=0.0)
+        self._cols = int(max(max_x, 0.0) // GRID_CELL) + 1
+        self._rows = int(max(max_y, 0.0) // GRID_CELL) + 1
+        self._cells = [None] * (self._cols * self._rows)
+        for i in range(len(self.text)):
+            c0, r0, c1, r1 = self._cell_span(*self.box(i))
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    k = r * self._cols + c
+                    if self._cells[k] is None:
+                        self._cells[k] = array("i")
+                    self._cells[k].append(i)
+
+    def _cell_span(self, x0, y0, x1, y1):
+        # Clamp to the grid so boxes and queries outside the page still map to edge cells
+        c0 = min(max(int(x0 // GRID_CELL), 0), self._cols - 1)
+        c1 = min(max(int(x1 // GRID_CELL), 0), self._cols - 1)
+        r0 = min(max(int(y0 // GRID_CELL), 0), self._rows - 1)
+        r1 = min(max(int(y1 // GRID_CELL), 0), self._rows - 1)
+        return c0, r0, c1, r1
+
+    def __len__(self):
+        return len(self.text)
+
+    def to_bytes(self) -> bytes:
+        # Word count, then the raw arrays, then NUL-separated words (words never contain NUL)
+        text = "\0".join(self.text).encode("utf-8")
+        return struct.pack("<I", len(self.text)) + self.boxes.tobytes() + self.order.tobytes() + text
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PageWords":
+        (n,) = struct.unpack_from("<I", data)
+        pw = cls.__new__(cls)
+        pw.boxes = array("f")
+        pw.order = array("i")
+        start = 4
+        end = start + 4 * n * pw.boxes.itemsize
+        pw.boxes.frombytes(data[start:end])
+        start, end = end, end + 3 * n * pw.order.itemsize
+        pw.order.frombytes(data[start:end])
+        pw.text = data[end:].decode("utf-8").split("\0") if n else []
+        pw._build_grid()
+        return pw
+
+    def box(self, i):
+        j = 4 * i
+        return self.boxes[j], self.boxes[j + 1], self.boxes[j + 2], self.boxes[j + 3]
+
+    def intersecting(self, x0, y0, x1, y1):
+        """Return indices of words overlapping the rectangle (x0, y0)-(x1, y1), in points."""
+        if x1 <= x0 or y1 <= y0 or not self.text:
+            return []
+        # Candidates come from the cells under the rectangle; a word spanning cells appears once
+        c0, r0, c1, r1 = self._cell_span(x0, y0, x1, y1)
+        candidates = set()
+        for r in range(r0, r1 + 1):
+            base = r * self._cols
+            for k in range(base + c0, base + c1 + 1):
+                cell = self._cells[k]
+                if cell is not None:
+                    candidates.update(cell)
+        boxes = self.boxes
+        hits = []
+        for i in sorted(candidates):
+            j = 4 * i
+            if boxes[j] < x1 and x0 < boxes[j + 2] and boxes[j + 1] < y1 and y0 < boxes[j + 3]:
+                hits.append(i)
+        return hits
+
+    def text_for(self, indices) -> str:
+        """Join the given words in reading order, with newlines between lines."""
+        if not indices:
+            return ""
+        order = self.order
+        boxes = self.boxes
+        selected = sorted(
+            indices,
+            key=lambda i: (order[3 * i], order[3 * i + 1], order[3 * i + 2], boxes[4 * i + 1], boxes[4 * i])
+        )
+        out = []
+        last_key = None
+        for i in selected:
+            key = (order[3 * i], order[3 * i + 1])
+            if last_key is not None and key != last_key:
+                out.append("\n")
+            elif out and not out[-1].endswith(("\n", " ")):
+                out.append(" ")
+            out.append(self.text[i])
+            last_key = key
+        return "".join(out).strip()
+
+
+class WordBoxCache:
+    """Per-document cache of PageWords; each page's text is extracted once and reused at every zoom."""
+
+    def __init__(self):
+        self._pages = {}
+
+    def __contains__(self, page_index):
+        return page_index in self._pages
+
+    def get(self, page_index):
+        return self._pages.get(page_index)
+
+    def put(self, page_index, page_words: PageWords):
+        self._pages[page_index] = page_words
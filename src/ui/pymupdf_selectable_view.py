@@ -1,65 +1,143 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel, QApplication, QMenu
-from PyQt5.QtGui import QPainter, QPixmap, QImage, QColor, QPen, QKeySequence
-from PyQt5.QtCore import Qt, QRectF, QPoint, QSize
+from PyQt5.QtGui import QPainter, QColor, QPen, QKeySequence
+from PyQt5.QtCore import Qt, QRect, QRectF, QPoint, QSize, QTimer
 import fitz  # PyMuPDF
+from ui.pdf_render_service import PageRenderService, VISIBLE_PRIORITY
+from ui.rendered_image import RenderedImage
+from ui.pdf_tile_cache import TileCache
+from ui.pdf_word_boxes import PageWords, WordBoxCache
+from utils.fitz_lock import FITZ_LOCK
+
+# Pages within this many viewport heights of the visible area are rendered ahead of time
+PREFETCH_VIEWPORTS = 1.0
+# Pages further away than this many viewport heights drop their pixmap
+KEEP_VIEWPORTS = 3.0
+# Sharp re-render after a zoom change waits until the slider has been still this long
+ZOOM_SETTLE_MS = 200
+# Above this zoom pages are rendered as fixed-size tiles instead of one full-page pixmap
+TILED_ZOOM_THRESHOLD = 2.0
+# Tile edge in device pixels
+TILE_SIZE = 512
+# Tiled pages keep a low-resolution full-page underlay at this zoom while tiles load
+TILE_BASE_ZOOM = 1.0
 
 class SelectablePdfPage(QWidget):
-    def __init__(self, doc: fitz.Document, page_index: int, zoom: float = 1.5, parent=None):
+    def __init__(self, doc: fitz.Document, page_index: int, page_rect: fitz.Rect, zoom: float = 1.5, parent=None,
+                 tile_cache: TileCache = None):
         super().__init__(parent)
         self.doc = doc
         self.page_index = page_index
         self.zoom = zoom
-        self.page = self.doc.load_page(page_index)
-        self.words = []          # list[(x0,y0,x1,y1,word,block,line,word_no)]
+        self.tile_cache = tile_cache
+        # Only the page geometry is known up front; rasterizing waits until the page is near the viewport
+        self.page_rect = page_rect
+        self.page_words = None   # PageWords shared through the viewer's WordBoxCache
         self.selection_active = False
         self.sel_anchor = QPoint()
         self.sel_current = QPoint()
         self.selection_rect = QRectF()
         self._pixmap = None
-        self._render()
+        self._pixmap_zoom = None  # zoom the current pixmap was rendered at
+        self._apply_size()
 
         # Shortcut: Ctrl+C to copy selected text
         self.shortcut_copy = QKeySequence(Qt.CTRL + Qt.Key_C)
 
     def sizeHint(self) -> QSize:
-        if self._pixmap is not None:
-            return self._pixmap.size()
-        return super().sizeHint()
-
-    def _render(self):
-        # Render page pixmap
-        m = fitz.Matrix(self.zoom, self.zoom)
-        pix = self.page.get_pixmap(matrix=m)
-        fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
-        img = QImage(bytes(pix.samples), pix.width, pix.height, pix.stride, fmt)
-        self._pixmap = QPixmap.fromImage(img)
-
-        # Extract word boxes (points) and cache scaled rects in device pixels
-        # words: (x0, y0, x1, y1, word, block_no, line_no, word_no)
-        self.words = self.page.get_text("words", sort=True) or []
-        self._word_rects = []
-        for (x0, y0, x1, y1, w, b, l, wn) in self.words:
-            rx0 = x0 * self.zoom
-            ry0 = y0 * self.zoom
-            rx1 = x1 * self.zoom
-            ry1 = y1 * self.zoom
-            self._word_rects.append((QRectF(rx0, ry0, rx1 - rx0, ry1 - ry0), w, b, l, wn))
-
-        self.setMinimumSize(self._pixmap.size())
+        return self._page_size()
+
+    def _page_size(self) -> QSize:
+        return QSize(int(round(self.page_rect.width * self.zoom)),
+                     int(round(self.page_rect.height * self.zoom)))
+
+    def _apply_size(self):
+        # Placeholder size matches the rendered page so the scroll range is right before rendering
+        self.setFixedSize(self._page_size())
+
+    @property
+    def is_rendered(self) -> bool:
+        return self._pixmap is not None
+
+    @property
+    def tiled(self) -> bool:
+        return self.tile_cache is not None and self.zoom > TILED_ZOOM_THRESHOLD
+
+    @property
+    def render_zoom(self) -> float:
+        # Zoom of the full-page pixmap: the real zoom, or the cheap underlay zoom when tiled
+        return TILE_BASE_ZOOM if self.tiled else self.zoom
+
+    @property
+    def needs_render(self) -> bool:
+        # True while the page shows a placeholder or a scaled preview from another zoom;
+        # tiled pages accept any full-page pixmap as their underlay
+        if self._pixmap is None:
+            return True
+        return not self.tiled and self._pixmap_zoom != self.zoom
+
+    def tile_range(self, rect: QRect):
+        """Return (col0, row0, col1, row1) of the tiles covering `rect` (page coordinates)."""
+        size = self._page_size()
+        cols = max(1, (size.width() + TILE_SIZE - 1) // TILE_SIZE)
+        rows = max(1, (size.height() + TILE_SIZE - 1) // TILE_SIZE)
+        col0 = min(max(rect.left() // TILE_SIZE, 0), cols - 1)
+        col1 = min(max(rect.right() // TILE_SIZE, 0), cols - 1)
+        row0 = min(max(rect.top() // TILE_SIZE, 0), rows - 1)
+        row1 = min(max(rect.bottom() // TILE_SIZE, 0), rows - 1)
+        return col0, row0, col1, row1
+
+    def release(self):
+        # Drop the pixmap and word boxes; the placeholder keeps its size
+        self._pixmap = None
+        self._pixmap_zoom = None
+        self.page_words = None
+        self.selection_active = False
+        self.selection_rect = QRectF()
+        self.update()
+
+    def set_page_image(self, image: RenderedImage, page_words: PageWords, zoom: float):
+        # Called by the viewer with a finished render; word boxes stay in points
+        self._pixmap = image.to_pixmap()
+        self._pixmap_zoom = zoom
+        self.page_words = page_words
         self.update()
 
     def set_zoom(self, zoom: float):
         if zoom <= 0:
             return
         self.zoom = zoom
+        self.selection_active = False
         self.selection_rect = QRectF()
-        self._render()
+        # Keep the old pixmap as a scaled preview; the viewer re-renders once the zoom settles
+        self._apply_size()
+        self.update()
 
     def paintEvent(self, event):
-        if not self._pixmap:
-            return
         p = QPainter(self)
-        p.drawPixmap(0, 0, self._pixmap)
+        tiled = self.tiled
+        if not self._pixmap:
+            # Placeholder until the page is rendered
+            p.fillRect(self.rect(), QColor(255, 255, 255))
+            p.setPen(QColor(189, 189, 189))
+            p.drawRect(self.rect().adjusted(0, 0, -1, -1))
+            p.drawText(self.rect(), Qt.AlignCenter, f"Page {self.page_index + 1}")
+            if not tiled:
+                p.end()
+                return
+        elif self._pixmap_zoom == self.zoom:
+            p.drawPixmap(0, 0, self._pixmap)
+        else:
+            # Preview: stretch the stale pixmap, favouring speed over quality
+            p.drawPixmap(self.rect(), self._pixmap)
+
+        if tiled:
+            # Sharp tiles over the underlay, only for the exposed area
+            col0, row0, col1, row1 = self.tile_range(event.rect())
+            for row in range(row0, row1 + 1):
+                for col in range(col0, col1 + 1):
+                    tile = self.tile_cache.get((self.page_index, self.zoom, col, row))
+                    if tile is not None:
+                        p.drawPixmap(col * TILE_SIZE, row * TILE_SIZE, tile)
 
         # Highlight selected words
         if not self.selection_rect.isNull():
@@ -67,9 +145,10 @@ class SelectablePdfPage(QWidget):
             sel_brush = QColor(33, 150, 243, 60)
             p.setPen(sel_pen)
             p.setBrush(sel_brush)
-            for rect, *_ in self._word_rects:
-                if rect.intersects(self.selection_rect):
-                    p.drawRect(rect)
+            z = self.zoom
+            for i in self._selected_word_indices():
+                x0, y0, x1, y1 = self.page_words.box(i)
+                p.drawRect(QRectF(x0 * z, y0 * z, (x1 - x0) * z, (y1 - y0) * z))
 
         # Draw the selection marquee
         if self.selection_active and not self.selection_rect.isNull():
@@ -124,29 +203,18 @@ class SelectablePdfPage(QWidget):
             return
         super().keyPressEvent(e)
 
+    def _selected_word_indices(self):
+        # Hit-test in PDF points: map the marquee back through the zoom instead of scaling every word
+        if self.page_words is None or self.selection_rect.isNull():
+            return []
+        r = self.selection_rect
+        z = self.zoom
+        return self.page_words.intersecting(r.left() / z, r.top() / z, r.right() / z, r.bottom() / z)
+
     def selected_text(self) -> str:
-        if self.selection_rect.isNull():
+        if self.page_words is None:
             return ""
-        # Collect intersecting words and sort by block/line/word_no for reading order
-        selected = []
-        for (rect, w, b, l, wn) in self._word_rects:
-            if rect.intersects(self.selection_rect):
-                selected.append((b, l, wn, rect.y(), rect.x(), w))
-        if not selected:
-            return ""
-        selected.sort(key=lambda t: (t[0], t[1], t[2], t[3], t[4]))
-        # Join words with spaces, inserting newlines on line changes
-        out = []
-        last_key = None
-        for (b, l, wn, _y, _x, w) in selected:
-            key = (b, l)
-            if last_key is not None and key != last_key:
-                out.append("\n")
-            elif out and not out[-1].endswith(("\n", " ")):
-                out.append(" ")
-            out.append(w)
-            last_key = key
-        return "".join(out).strip()
+        return self.page_words.text_for(self._selected_word_indices())
 
     def copy_selection(self):
         text = self.selected_text()
@@ -157,16 +225,26 @@ class SelectablePdfViewer(QWidget):
     def __init__(self, pdf_path: str, zoom: float = 1.5, parent=None):
         super().__init__(parent)
         self.zoom = zoom
-        self.doc = fitz.open(pdf_path)
+        # Page sizes are all read in one pass, so the lock is taken once however long the document
+        with FITZ_LOCK:
+            self.doc = fitz.open(pdf_path)
+            page_rects = [page.rect for page in self.doc]
 
         self.container = QWidget(self)
         self.vbox = QVBoxLayout(self.container)
         self.vbox.setContentsMargins(0, 0, 0, 0)
         self.vbox.setSpacing(12)
 
+        # Pages start as placeholders; only those near the viewport hold a pixmap
         self.pages = []
-        for i in range(self.doc.page_count):
-            page_widget = SelectablePdfPage(self.doc, i, self.zoom, parent=self.container)
+        self._rendered = set()
+        self._requested = set()
+        self._tiled_pages = set()
+        self.word_cache = WordBoxCache()
+        self.tile_cache = TileCache()
+        for i, page_rect in enumerate(page_rects):
+            page_widget = SelectablePdfPage(self.doc, i, page_rect, self.zoom, parent=self.container,
+                                            tile_cache=self.tile_cache)
             self.vbox.addWidget(page_widget)
             self.pages.append(page_widget)
 
@@ -182,9 +260,155 @@ class SelectablePdfViewer(QWidget):
         root.setContentsMargins(0, 0, 0, 0)
         root.addWidget(self.scroll)
 
+        # Zoom changes show a scaled preview right away; the sharp render waits for the slider to settle
+        self._zoom_settle_timer = QTimer(self)
+        self._zoom_settle_timer.setSingleShot(True)
+        self._zoom_settle_timer.setInterval(ZOOM_SETTLE_MS)
+        self._zoom_settle_timer.timeout.connect(lambda: self._update_visible_pages(prefetch=False))
+
+        # Pages are rasterized off the GUI thread and handed back as QImages
+        self.render_service = PageRenderService(pdf_path, parent=self)
+        self.render_service.page_rendered.connect(self._on_page_rendered)
+        self.render_service.tile_rendered.connect(self._on_tile_rendered)
+
+        # Coalesce scroll/resize bursts into one visibility pass per event loop iteration
+        self._visibility_timer = QTimer(self)
+        self._visibility_timer.setSingleShot(True)
+        self._visibility_timer.setInterval(0)
+        self._visibility_timer.timeout.connect(self._update_visible_pages)
+        self.scroll.verticalScrollBar().valueChanged.connect(self._schedule_visibility_update)
+        self.scroll.verticalScrollBar().rangeChanged.connect(self._schedule_visibility_update)
+        self.scroll.horizontalScrollBar().valueChanged.connect(self._schedule_visibility_update)
+
     def set_zoom(self, zoom: float):
-        if zoom <= 0:
+        if zoom <= 0 or zoom == self.zoom:
             return
         self.zoom = zoom
         for p in self.pages:
-            p.set_zoom(self.zoom)
\ No newline at end of file
+            p.set_zoom(self.zoom)
+        self._zoom_settle_timer.start()
+
+    def close_document(self):
+        # Stop pending visibility passes and the render thread before the document goes away
+        self._zoom_settle_timer.stop()
+        self._visibility_timer.stop()
+        self.render_service.shutdown()
+        with FITZ_LOCK:
+            if not self.doc.is_closed:
+                self.doc.close()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_visibility_update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_visibility_update()
+
+    def _schedule_visibility_update(self, *_):
+        self._visibility_timer.start()
+
+    def _first_page_below(self, y: int) -> int:
+        # Pages are stacked top to bottom, so bisect on their bottom edge
+        lo, hi = 0, len(self.pages)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.pages[mid].geometry().bottom() < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def visible_page_range(self, margin: float = 0.0):
+        """Return (first, last) indices of pages within `margin` viewport heights of the view."""
+        if not self.pages:
+            return 0, -1
+        height = self.scroll.viewport().height()
+        top = self.scroll.verticalScrollBar().value() - int(margin * height)
+        bottom = self.scroll.verticalScrollBar().value() + height + int(margin * height)
+        first = self._first_page_below(top)
+        last = first
+        while last < len(self.pages) and self.pages[last].geometry().top() <= bottom:
+            last += 1
+        return first, last - 1
+
+    def _update_visible_pages(self, prefetch: bool = True):
+        if self.doc.is_closed:
+            return
+        first, last = self.visible_page_range()
+        near_first, near_last = self.visible_page_range(PREFETCH_VIEWPORTS)
+        keep_first, keep_last = self.visible_page_range(KEEP_VIEWPORTS)
+
+        # Drop pixmaps for pages that scrolled far away
+        for idx in list(self._rendered):
+            if idx < keep_first or idx > keep_last:
+                self.pages[idx].release()
+                self._rendered.discard(idx)
+
+        # Cancel queued renders for pages that left the prefetch band
+        for idx in list(self._requested):
+            if idx < near_first or idx > near_last:
+                self.render_service.cancel(idx)
+                self._requested.discard(idx)
+
+        # While the zoom slider is moving, pages keep showing their scaled preview
+        if self._zoom_settle_timer.isActive():
+            return
+
+        # Request pages in and around the viewport; visible pages jump the queue.
+        # After a zoom only the visible pages are re-rendered; the next scroll prefetches the rest.
+        if not prefetch:
+            near_first, near_last = first, last
+        for idx in range(max(near_first, 0), min(near_last, len(self.pages) - 1) + 1):
+            if not self.pages[idx].needs_render:
+                continue
+            if first <= idx <= last:
+                priority = VISIBLE_PRIORITY
+            else:
+                priority = 1 + min(abs(idx - first), abs(idx - last))
+            self.render_service.request(idx, self.pages[idx].render_zoom, priority,
+                                        with_words=idx not in self.word_cache)
+            self._requested.add(idx)
+
+        # Tiles are only rendered for the visible part of visible pages
+        for idx in list(self._tiled_pages):
+            if idx < first or idx > last or not self.pages[idx].tiled:
+                self.render_service.cancel_tiles(idx)
+                self._tiled_pages.discard(idx)
+        for idx in range(max(first, 0), min(last, len(self.pages) - 1) + 1):
+            if self.pages[idx].tiled:
+                self._request_tiles(idx)
+
+    def _request_tiles(self, page_index):
+        page = self.pages[page_index]
+        view = QRect(self.scroll.horizontalScrollBar().value(), self.scroll.verticalScrollBar().value(),
+                     self.scroll.viewport().width(), self.scroll.viewport().height())
+        geom = page.geometry()
+        visible = geom.intersected(view).translated(-geom.topLeft())
+        if visible.isEmpty():
+            return
+        col0, row0, col1, row1 = page.tile_range(visible)
+        wanted = set()
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                if (page_index, self.zoom, col, row) in self.tile_cache:
+                    continue
+                wanted.add((col, row))
+                self.render_service.request_tile(page_index, self.zoom, col, row, TILE_SIZE)
+        self.render_service.cancel_tiles(page_index, keep=wanted)
+        self._tiled_pages.add(page_index)
+
+    def _on_tile_rendered(self, page_index, zoom, col, row, image):
+        if zoom != self.zoom or not (0 <= page_index < len(self.pages)):
+            return
+        self.tile_cache.put((page_index, zoom, col, row), image.to_pixmap())
+        self.pages[page_index].update(QRect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+    def _on_page_rendered(self, page_index, zoom, image, words):
+        self._requested.discard(page_index)
+        if not (0 <= page_index < len(self.pages)) or zoom != self.pages[page_index].render_zoom:
+            return
+        if words is not None:
+            self.word_cache.put(page_index, words)
+        self.pages[page_index].set_page_image(image, self.word_cache.get(page_index), zoom)
+        self._rendered.add(page_index)
@@ -2,19 +2,13 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea, QGroupBox, QProgressBar, QHBoxLayout
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtGui import QFont
 import os
-import openai
 import json
-import io
-import math
 import fitz  # PyMuPDF
-
-try:
-    from matplotlib.figure import Figure
-    MATPLOTLIB_AVAILABLE = True
-except Exception:
-    MATPLOTLIB_AVAILABLE = False
+from utils.fitz_lock import FITZ_LOCK
+from utils.openai_cache import chat_completion_text
+from ui.chart_service import chart_service, TOPIC_PIE
 
 
 class TopicAnalysisWorker(QThread):
@@ -34,18 +28,17 @@ class TopicAnalysisWorker(QThread):
             if not self.api_key:
                 raise ValueError("OpenAI API key not found.")
 
-            openai.api_key = self.api_key
-
             # Extract text from PDF
-            doc = fitz.open(self.pdf_path)
             full_text = []
-            for page_num in range(min(len(doc), 20)):  # Limit to first 20 pages for performance
-                page = doc.load_page(page_num)
-                try:
-                    full_text.append(page.get_text("text"))
-                except Exception:
-                    continue
-            doc.close()
+            with FITZ_LOCK:
+                doc = fitz.open(self.pdf_path)
+                for page_num in range(min(len(doc), 20)):  # Limit to first 20 pages for performance
+                    page = doc.load_page(page_num)
+                    try:
+                        full_text.append(page.get_text("text"))
+                    except Exception:
+                        continue
+                doc.close()
             
             pdf_text = "\n\n".join(full_text)
             # Truncate to avoid token limits (keep first 15000 chars)
@@ -89,14 +82,13 @@ Rules:
 - Return only valid JSON, no explanations.
 """
 
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
+            result_text = chat_completion_text(
+                "gpt-4o",
+                [{"role": "user", "content": prompt}],
+                api_key=self.api_key,
                 max_tokens=1500,
                 temperature=0.3
-            )
-
-            result_text = response.choices[0].message.content.strip()
+            ).strip()
             # Extract JSON
             start = result_text.find('{')
             end = result_text.rfind('}') + 1
@@ -211,43 +203,14 @@ class QPAnalysisWindow(QWidget):
         while topics_layout.count():
             topics_layout.takeAt(0).widget().deleteLater()
 
-        # Pie chart (larger and clearer)
-        if MATPLOTLIB_AVAILABLE:
-            try:
-                fig = Figure(figsize=(6.0, 6.0), dpi=100)
-                ax = fig.add_subplot(111)
-                names = [t["name"] for t in topics]
-                counts = [t["count"] for t in topics]
-                colors = self._get_colors(len(names))
-
-                wedges, texts, autotexts = ax.pie(
-                    counts,
-                    labels=names,
-                    colors=colors,
-                    autopct="%1.1f%%",
-                    startangle=90
-                )
-                ax.set_aspect("equal")
-                for autotext in autotexts:
-                    autotext.set_color("white")
-                    autotext.set_fontsize(11)
-                    autotext.set_weight("bold")
-                for text in texts:
-                    text.set_fontsize(10)
-                    text.set_weight("bold")
-
-                fig.tight_layout()
-                buf = io.BytesIO()
-                fig.savefig(buf, format="png", transparent=True, dpi=100)
-                buf.seek(0)
-                pix = QPixmap()
-                if pix.loadFromData(buf.getvalue(), "PNG"):
-                    img_lbl = QLabel()
-                    img_lbl.setAlignment(Qt.AlignCenter)
-                    img_lbl.setPixmap(pix.scaledToWidth(550, Qt.SmoothTransformation))
-                    topics_layout.addWidget(img_lbl, alignment=Qt.AlignCenter)
-            except Exception:
-                pass
+        # Pie chart (larger and clearer), drawn off the GUI thread and cached by the topic counts
+        self.chart_label = QLabel("Rendering chart...")
+        self.chart_label.setAlignment(Qt.AlignCenter)
+        self.chart_label.setStyleSheet("color:#999;")
+        topics_layout.addWidget(self.chart_label, alignment=Qt.AlignCenter)
+        colors = self._get_colors(len(topics))
+        chart_data = tuple((t["name"], t["count"], color) for t, color in zip(topics, colors))
+        chart_service().request(TOPIC_PIE, chart_data, self._on_chart_ready)
 
         # Topic list with bars
         topics_layout.addSpacing(20)
@@ -289,6 +252,13 @@ class QPAnalysisWindow(QWidget):
 
         topics_layout.addSpacing(20)
 
+    def _on_chart_ready(self, pixmap, error):
+        if pixmap is None:
+            self.chart_label.setText(error)
+            return
+        self.chart_label.setStyleSheet("")
+        self.chart_label.setPixmap(pixmap)
+
     def _get_colors(self, n):
         """Generate n distinct colors."""
         colors = [
@@ -0,0 +1,133 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+
+STATE_COLORS = {
+    "not_visited": "#bdbdbd",      # grey
+    "current" : "#f9f9f9",         #white
+    "not_answered": "#e57373",     # red
+    "answered": "#66bb6a",         # green
+    "review": "#7e57c2",           # purple
+}
+
+STATE_ROLE = Qt.UserRole
+CURRENT_ROLE = Qt.UserRole + 1
+
+# Size of one palette chip and of the grid cell it sits in
+CHIP_SIZE = QSize(40, 36)
+CELL_SIZE = QSize(48, 44)
+
+
+class QuestionPaletteModel(QAbstractListModel):
+    """
+    One row per question over the test window's question_states list (shared, not copied).
+    The window changes states in place and calls refresh() / set_current(); each call repaints
+    at most two chips.
+    """
+
+    def __init__(self, states, parent=None):
+        super().__init__(parent)
+        self._states = states
+        self.current = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._states)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return str(row + 1)
+        if role == STATE_ROLE:
+            return self._states[row]
+        if role == CURRENT_ROLE:
+            return row == self.current
+        if role == Qt.ToolTipRole:
+            return f"Question {row + 1}: {self._states[row].replace('_', ' ')}"
+        return None
+
+    def set_states(self, states):
+        """Switch to a new question_states list (e.g. one restored from a journal)."""
+        self.beginResetModel()
+        self._states = states
+        self.endResetModel()
+
+    def refresh(self, row):
+        """Repaint one question after its state changed."""
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [STATE_ROLE, CURRENT_ROLE, Qt.ToolTipRole])
+
+    def set_current(self, row):
+        """Move the current-question marker; repaints the previous and the new current question."""
+        previous, self.current = self.current, row
+        self.refresh(previous)
+        if row != previous:
+            self.refresh(row)
+
+
+class QuestionPaletteDelegate(QStyledItemDelegate):
+    """Paints a question as a rounded chip in its state's colour, outlined in black when current."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Arial", 12, QFont.Bold)
+        self.colors = {state: QColor(color) for state, color in STATE_COLORS.items()}
+        self.border = QPen(QColor("#888"), 1)
+        self.current_border = QPen(QColor("#000"), 2)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        current = index.data(CURRENT_ROLE)
+        pen = self.current_border if current else self.border
+        chip = QRectF(option.rect.center().x() - CHIP_SIZE.width() / 2 + 1,
+                      option.rect.center().y() - CHIP_SIZE.height() / 2 + 1,
+                      CHIP_SIZE.width() - 1, CHIP_SIZE.height() - 1)
+        painter.setPen(pen)
+        painter.setBrush(self.colors.get(index.data(STATE_ROLE), self.colors["not_visited"]))
+        painter.drawRoundedRect(chip, 15, 15)
+        painter.setFont(self.font)
+        painter.setPen(Qt.black)
+        painter.drawText(chip, Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return CELL_SIZE
+
+
+class QuestionPaletteView(QListView):
+    """
+    Wrapping grid of question chips. Items have one uniform size and are painted by the delegate,
+    so the view lays out and draws only what is visible; no widget exists per question.
+    Emits question_clicked(index) when a chip is clicked.
+    """
+    question_clicked = pyqtSignal(int)
+
+    def __init__(self, states, parent=None):
+        super().__init__(parent)
+        self.palette_model = QuestionPaletteModel(states, self)
+        self.setModel(self.palette_model)
+        self.setItemDelegate(QuestionPaletteDelegate(self))
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setGridSize(CELL_SIZE)
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.clicked.connect(self._on_clicked)
+
+    def _on_clicked(self, index):
+        if index.isValid():
+            self.question_clicked.emit(index.row())
+
+    def show_current(self, row):
+        """Mark `row` as current and scroll it into view."""
+        self.palette_model.set_current(row)
+        self.scrollTo(self.palette_model.index(row))
@@ -0,0 +1,16 @@
+from PyQt5.QtGui import QImage, QPixmap
+
+
+class RenderedImage:
+    """
+    A finished off-thread render: a QImage that wraps its sample buffer without copying, plus a
+    reference that keeps the buffer alive until the GUI thread turns it into a QPixmap.
+    """
+    __slots__ = ("image", "_buffer")
+
+    def __init__(self, image: QImage, buffer):
+        self.image = image
+        self._buffer = buffer
+
+    def to_pixmap(self) -> QPixmap:
+        return QPixmap.fromImage(self.image)
@@ -0,0 +1,121 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QBrush, QColor
+
+HEADERS = ["Question", "Type", "Your Answer", "Correct Answer"]
+
+# Row filters offered above the table: (label, test on a utils.result_stats.QuestionRow)
+FILTER_ALL = "All"
+FILTERS = {
+    FILTER_ALL: None,
+    "Correct": lambda r: r.correct,
+    "Wrong": lambda r: r.attempted and r.has_key and not r.correct,
+    "Not attempted": lambda r: not r.attempted,
+}
+
+_WHITE = QBrush(QColor(Qt.white))
+_GREEN = QBrush(QColor(Qt.green))
+_RED = QBrush(QColor(Qt.red))
+_GRAY = QBrush(QColor(Qt.lightGray))
+
+
+def _outcome_rank(row):
+    # "Your Answer" sorts by outcome: correct, wrong, attempted without a key, not attempted
+    if row.correct:
+        return 0
+    if row.attempted and row.has_key:
+        return 1
+    return 2 if row.attempted else 3
+
+
+# Sort key per column
+_SORT_KEYS = (
+    lambda r: r.index,
+    lambda r: (r.type or "", r.index),
+    lambda r: (_outcome_rank(r), r.user_display, r.index),
+    lambda r: (r.correct_display, r.index),
+)
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    Read-only question-wise table over ResultStats.rows. Cells are produced on demand by data(),
+    so the view only materializes what is on screen. Sorting and filtering reorder a list of row
+    numbers (computed from the row tuples), never widgets or item objects.
+    """
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self._rows = stats.rows
+        self._order = list(range(len(self._rows)))  # row numbers shown, in display order
+        self._filter = FILTER_ALL
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def question_row(self, row):
+        """The QuestionRow shown at view row `row`."""
+        return self._rows[self._order[row]]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.question_row(index.row())
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return f"Q{row.index + 1}"
+            if col == 1:
+                return row.type.upper() if row.type else "--"
+            return row.user_display if col == 2 else row.correct_display
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.BackgroundRole:
+            if col == 2:
+                if row.correct:
+                    return _GREEN
+                return _RED if row.attempted and row.has_key else _GRAY
+            if col == 3 and row.attempted and row.has_key and not row.correct:
+                return _GREEN
+        if role == Qt.ForegroundRole:
+            wrong = row.attempted and row.has_key and not row.correct
+            if (col == 2 and (row.correct or wrong)) or (col == 3 and wrong):
+                return _WHITE
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_rows = [self._order[i.row()] for i in persistent]
+        self._sort_column, self._sort_order = column, order
+        self._apply_sort()
+        position = {r: p for p, r in enumerate(self._order)}
+        self.changePersistentIndexList(
+            persistent, [self.index(position[r], i.column()) for r, i in zip(source_rows, persistent)])
+        self.layoutChanged.emit()
+
+    def set_filter(self, name):
+        """Show only the rows passing FILTERS[name], keeping the current sort."""
+        if name == self._filter:
+            return
+        self.beginResetModel()
+        self._filter = name
+        test = FILTERS[name]
+        rows = self._rows
+        self._order = [i for i in range(len(rows)) if test is None or test(rows[i])]
+        self._apply_sort()
+        self.endResetModel()
+
+    def _apply_sort(self):
+        key = _SORT_KEYS[self._sort_column]
+        rows = self._rows
+        self._order.sort(key=lambda i: key(rows[i]), reverse=self._sort_order == Qt.DescendingOrder)
@@ -1,158 +1,29 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTableWidget, QTableWidgetItem, QGroupBox, QScrollArea, QWidget as QtWidget
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QTableView, QHeaderView, QGroupBox, QScrollArea, QWidget as QtWidget
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QPixmap
-import math
-from fractions import Fraction
-import io
+from PyQt5.QtGui import QFont
 from ui.qp_analysis_window import QPAnalysisWindow
+from ui.chart_service import chart_service, RESULTS_DONUT
+from ui.results_table_model import ResultsTableModel, FILTERS
+from utils.result_stats import get_result_stats
+# Answer helpers live in utils.answers (shared with db.storage); re-exported under their old names
+from utils.answers import (
+    MCQ_MAP_IDX_TO_LETTER, MCQ_MAP_LETTER_TO_IDX,
+    normalize_answer_item as _normalize_answer_item,
+    display_value as _display_value,
+    parse_numeric as _parse_numeric,
+    compare_answers as _compare_answers,
+)
 
-# Safe matplotlib (Agg only, no Qt backends, no pyplot)
-MATPLOTLIB_AVAILABLE = False
-try:
-    import matplotlib
-    matplotlib.use("Agg")  # force non-GUI backend
-    from matplotlib.figure import Figure
-    MATPLOTLIB_AVAILABLE = True
-except Exception:
-    MATPLOTLIB_AVAILABLE = False
-
-MCQ_MAP_IDX_TO_LETTER = {0: "A", 1: "B", 2: "C", 3: "D"}
-MCQ_MAP_LETTER_TO_IDX = {"A": 0, "B": 1, "C": 2, "D": 3}
-
-def _normalize_answer_item(item):
-    """
-    Normalize an answer record to {"type": "mcq"|"numeric"|"text", "value": ...} or None.
-    Accepts legacy formats: None, int (MCQ index), or string.
-    """
-    if item is None:
-        return None
-
-    # Already structured
-    if isinstance(item, dict) and "type" in item:
-        t = str(item.get("type", "")).lower()
-        v = item.get("value", None)
-        if t == "mcq":
-            # Normalize mcq value to 0..3
-            if isinstance(v, int):
-                return {"type": "mcq", "value": v if 0 <= v <= 3 else None}
-            if isinstance(v, str):
-                s = v.strip().upper()
-                if s in MCQ_MAP_LETTER_TO_IDX:
-                    return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX[s]}
-                # try first char
-                return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX.get(s[:1], None)}
-            return {"type": "mcq", "value": None}
-        if t == "numeric":
-            # Keep string form; strip spaces
-            if v is None:
-                return {"type": "numeric", "value": None}
-            return {"type": "numeric", "value": str(v).strip()}
-        if t == "text":
-            if v is None:
-                return {"type": "text", "value": None}
-            return {"type": "text", "value": str(v).strip()}
-        # Unknown type -> None
-        return None
-
-    # Legacy: int -> MCQ index
-    if isinstance(item, int):
-        return {"type": "mcq", "value": item if 0 <= item <= 3 else None}
-    # Legacy: string value (assume text)
-    if isinstance(item, str):
-        s = item.strip()
-        # If single letter A-D, treat as MCQ
-        if len(s) == 1 and s.upper() in MCQ_MAP_LETTER_TO_IDX:
-            return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX[s.upper()]}
-    return {"type": "text", "value": item} if isinstance(item, str) else None
-
-def _display_value(item):
-    """Return a user-friendly string for table display."""
-    if item is None:
-        return "--"
-    t = item.get("type")
-    v = item.get("value")
-    if v is None:
-        return "--"
-    if t == "mcq":
-        return MCQ_MAP_IDX_TO_LETTER.get(v, "--")
-    return str(v)
-
-def _parse_numeric(s):
-    """Parse numeric string to float; supports integers, decimals, and simple fractions like 1/3."""
-    if s is None:
-        return None
-    s = str(s).strip().replace(" ", "")
-    if s == "":
-        return None
-    try:
-        if "/" in s:
-            # Handle simple fraction a/b (no mixed numbers)
-            return float(Fraction(s))
-        return float(s)
-    except Exception:
-        return None
-
-def _compare_answers(user_item, correct_item, numeric_tol=1e-3):
-    """
-    Compare user vs correct.
-    Returns (is_attempted, is_correct, has_correct_key).
-    - is_attempted: user has a non-None value
-    - is_correct: based on type-specific comparison
-    - has_correct_key: correct key exists (type+value present)
-    """
-    u = _normalize_answer_item(user_item)
-    c = _normalize_answer_item(correct_item)
-
-    # Attempted?
-    is_attempted = (u is not None and u.get("value") is not None)
-
-    # Correct key presence?
-    has_correct_key = (c is not None and c.get("value") is not None)
-
-    # If user not attempted, incorrect by definition (for stats), no score change
-    if not is_attempted:
-        return False, False, has_correct_key
-
-    # If no correct key provided, we can't judge correctness.
-    if not has_correct_key:
-        return True, False, False
-
-    ut, uv = u.get("type"), u.get("value")
-    ct, cv = c.get("type"), c.get("value")
-
-    # If types mismatch, treat as incorrect
-    if ut != ct:
-        return True, False, True
-
-    if ut == "mcq":
-        return True, (uv == cv), True
-
-    if ut == "numeric":
-        u_num = _parse_numeric(uv)
-        c_num = _parse_numeric(cv)
-        if u_num is None or c_num is None:
-            # Fall back to string match if parsing fails
-            return True, (str(uv).strip() == str(cv).strip()), True
-        # Absolute or relative tolerance
-        if math.isclose(u_num, c_num, rel_tol=1e-6, abs_tol=numeric_tol):
-            return True, True, True
-        return True, False, True
-
-    if ut == "text":
-        # Case-insensitive, collapse whitespace
-        u_norm = " ".join(str(uv).split()).strip().lower()
-        c_norm = " ".join(str(cv).split()).strip().lower()
-        return True, (u_norm == c_norm), True
-
-    return True, False, True
+# Rows the question table samples when sizing its columns
+RESIZE_SAMPLE_ROWS = 50
 
 
 class ResultsWindow(QWidget):
     def __init__(self, answers, correct_answers=None, time_taken=0, total_time=60,
-                 marks_per_correct=1.0, negative_mark=0.0, exam_type="Other", pdf_path=None):
+                 marks_per_correct=1.0, negative_mark=0.0, exam_type="Other", pdf_path=None, attempt_uuid=None):
         super().__init__()
         # Store as provided; normalization happens in comparison and display
         self.answers = answers or []
@@ -164,6 +35,10 @@ class ResultsWindow(QWidget):
         self.negative_mark = float(negative_mark)
         self.exam_type = exam_type
         self.pdf_path = pdf_path
+        self.attempt_uuid = attempt_uuid
+        # Computed once per attempt and shared with the paper analysis window
+        self.stats = get_result_stats(self.answers, self.correct_answers, self.marks_per_correct,
+                                      self.negative_mark, attempt_uuid=attempt_uuid)
         
         self.setWindowTitle('Test Results')
         self.setGeometry(200, 200, 1100, 680)
@@ -185,30 +60,15 @@ class ResultsWindow(QWidget):
         title_label.setStyleSheet("color: #1976d2; margin-bottom: 10px;")
         left_col.addWidget(title_label)
         
-        # Compute statistics
-        attempted = 0
-        correct = 0
-        incorrect_scored = 0
-        questions_with_key = 0
-        for i in range(self.num_questions):
-            is_attempted, is_correct, has_key = _compare_answers(self.answers[i], self.correct_answers[i])
-            if is_attempted:
-                attempted += 1
-            if is_correct:
-                correct += 1
-            if has_key:
-                questions_with_key += 1
-                # Count incorrect only when a correct key exists and user attempted but was wrong
-                if is_attempted and not is_correct:
-                    incorrect_scored += 1
-
-        incorrect = max(0, attempted - correct)
-        not_attempted = max(0, self.num_questions - attempted)
-        overall_accuracy = (correct / self.num_questions * 100.0) if self.num_questions > 0 else 0.0
-        attempted_accuracy = (correct / attempted * 100.0) if attempted > 0 else 0.0
-        # Score using marking scheme
-        total_score = (correct * self.marks_per_correct) + (incorrect_scored * self.negative_mark)
-        max_score = self.num_questions * self.marks_per_correct  # simple max assuming uniform marks
+        stats = self.stats
+        attempted = stats.attempted
+        correct = stats.correct
+        incorrect = stats.incorrect
+        not_attempted = stats.not_attempted
+        overall_accuracy = stats.overall_accuracy
+        attempted_accuracy = stats.attempted_accuracy
+        total_score = stats.score
+        max_score = stats.max_score
 
         # Summary section (left)
         summary_box = QGroupBox("Test Summary")
@@ -278,56 +138,29 @@ class ResultsWindow(QWidget):
         analysis_box.setFont(QFont("Arial", 14, QFont.Bold))
         analysis_layout = QVBoxLayout()
 
-        table = QTableWidget(self.num_questions, 4)
-        table.setHorizontalHeaderLabels(["Question", "Type", "Your Answer", "Correct Answer"])
+        # Filter above a model-backed view: only visible rows are ever turned into cells
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(QLabel("Show:"))
+        self.filter_combo = QComboBox()
+        self.filter_combo.addItems(list(FILTERS))
+        filter_row.addWidget(self.filter_combo)
+        filter_row.addStretch()
+        analysis_layout.addLayout(filter_row)
+
+        self.table_model = ResultsTableModel(stats, self)
+        self.filter_combo.currentTextChanged.connect(self.table_model.set_filter)
+        table = QTableView()
+        table.setModel(self.table_model)
         table.horizontalHeader().setStretchLastSection(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionMode(QTableWidget.NoSelection)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.setSelectionMode(QTableView.NoSelection)
         table.verticalHeader().setVisible(False)
-
-        for i in range(self.num_questions):
-            # Normalize items
-            u_item = _normalize_answer_item(self.answers[i])
-            c_item = _normalize_answer_item(self.correct_answers[i])
-
-            # Question number
-            q_item = QTableWidgetItem(f"Q{i+1}")
-            q_item.setTextAlignment(Qt.AlignCenter)
-            table.setItem(i, 0, q_item)
-
-            # Type
-            typ = (u_item or c_item or {"type": None}).get("type")
-            type_str = typ.upper() if typ else "--"
-            type_item = QTableWidgetItem(type_str)
-            type_item.setTextAlignment(Qt.AlignCenter)
-            table.setItem(i, 1, type_item)
-
-            # Answers (display)
-            user_disp = _display_value(u_item)
-            correct_disp = _display_value(c_item)
-            user_item = QTableWidgetItem(user_disp)
-            user_item.setTextAlignment(Qt.AlignCenter)
-            correct_item = QTableWidgetItem(correct_disp)
-            correct_item.setTextAlignment(Qt.AlignCenter)
-
-            # Correctness
-            is_attempted, is_correct, has_key = _compare_answers(self.answers[i], self.correct_answers[i])
-
-            if is_correct:
-                user_item.setBackground(Qt.green)
-                user_item.setForeground(Qt.white)
-            elif is_attempted and has_key:
-                user_item.setBackground(Qt.red)
-                user_item.setForeground(Qt.white)
-                correct_item.setBackground(Qt.green)
-                correct_item.setForeground(Qt.white)
-            else:
-                # Not attempted
-                user_item.setBackground(Qt.lightGray)
-
-            table.setItem(i, 2, user_item)
-            table.setItem(i, 3, correct_item)
-
+        # Fixed row height: the view never measures rows it does not show
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.setSortingEnabled(True)
+        table.sortByColumn(0, Qt.AscendingOrder)
+        # Size columns from the first rows only; cells are short and alike
+        table.horizontalHeader().setResizeContentsPrecision(RESIZE_SAMPLE_ROWS)
         table.resizeColumnsToContents()
         analysis_layout.addWidget(table)
         analysis_box.setLayout(analysis_layout)
@@ -362,57 +195,17 @@ class ResultsWindow(QWidget):
         chip_row.addWidget(score_chip)
         sc_layout.addLayout(chip_row)
 
-        # Pie chart (Correct/Wrong/Not Attempted) rendered to PNG via Agg
+        # Pie chart (Correct/Wrong/Not Attempted), drawn off the GUI thread and cached by its counts
         correct_cnt = correct
         wrong_cnt = incorrect
         not_attempt_cnt = not_attempted
-        pie_counts = [correct_cnt, wrong_cnt, not_attempt_cnt]
         pie_colors = ["#43a047", "#e53935", "#bdbdbd"]
 
-        if MATPLOTLIB_AVAILABLE:
-            try:
-                fig = Figure(figsize=(3.0, 3.0), dpi=140)
-                ax = fig.add_subplot(111)
-                total = sum(pie_counts) if sum(pie_counts) > 0 else 1
-                wedges, _ = ax.pie(
-                    pie_counts,
-                    colors=pie_colors,
-                    startangle=90,
-                    wedgeprops=dict(width=0.35, edgecolor="white")
-                )
-                ax.set(aspect="equal")
-                for w, c in zip(wedges, pie_counts):
-                    if total == 0 or c == 0:
-                        continue
-                    ang = (w.theta2 + w.theta1) / 2.0
-                    x, y = math.cos(math.radians(ang)), math.sin(math.radians(ang))
-                    pct = 100.0 * c / total
-                    ax.text(x*0.8, y*0.8, f"{pct:.0f}%", ha="center", va="center", fontsize=9, color="#333")
-                fig.tight_layout()
-                buf = io.BytesIO()
-                fig.savefig(buf, format="png", transparent=True)
-                buf.seek(0)
-                pix = QPixmap()
-                if pix.loadFromData(buf.getvalue(), "PNG"):
-                    img_lbl = QLabel()
-                    img_lbl.setAlignment(Qt.AlignCenter)
-                    img_lbl.setPixmap(pix)
-                    sc_layout.addWidget(img_lbl, alignment=Qt.AlignCenter)
-                else:
-                    fallback = QLabel("Chart rendering failed.")
-                    fallback.setAlignment(Qt.AlignCenter)
-                    fallback.setStyleSheet("color:#757575;")
-                    sc_layout.addWidget(fallback)
-            except Exception:
-                fallback = QLabel("Chart rendering failed.")
-                fallback.setAlignment(Qt.AlignCenter)
-                fallback.setStyleSheet("color:#757575;")
-                sc_layout.addWidget(fallback)
-        else:
-            fallback = QLabel("Install matplotlib to see the chart.")
-            fallback.setAlignment(Qt.AlignCenter)
-            fallback.setStyleSheet("color:#757575;")
-            sc_layout.addWidget(fallback)
+        self.chart_label = QLabel("Rendering chart...")
+        self.chart_label.setAlignment(Qt.AlignCenter)
+        self.chart_label.setStyleSheet("color:#757575;")
+        sc_layout.addWidget(self.chart_label, alignment=Qt.AlignCenter)
+        chart_service().request(RESULTS_DONUT, tuple(zip(stats.pie_counts, pie_colors)), self._on_chart_ready)
 
         # Legend-like labels and extra stats
         def pct_str(c):
@@ -461,7 +254,7 @@ class ResultsWindow(QWidget):
         neg_row = QHBoxLayout()
         neg_row.addWidget(QLabel("Negative Marks"))
         neg_row.addStretch()
-        neg_total = incorrect_scored * abs(self.negative_mark) if self.negative_mark < 0 else incorrect_scored * self.negative_mark
+        neg_total = stats.negative_total
         neg_val = QLabel(f"{neg_total:.2f}/{(self.num_questions * abs(self.negative_mark)):.2f}")
         neg_val.setStyleSheet("font-weight:600;")
         neg_row.addWidget(neg_val)
@@ -495,6 +288,13 @@ class ResultsWindow(QWidget):
         button_layout.addStretch()
         main_hbox.addLayout(button_layout)
 
+    def _on_chart_ready(self, pixmap, error):
+        if pixmap is None:
+            self.chart_label.setText(error)
+            return
+        self.chart_label.setStyleSheet("")
+        self.chart_label.setPixmap(pixmap)
+
     def open_qp_analysis(self):
         # Pass along what you need; you can extend later with topics/metadata
         self.qp_window = QPAnalysisWindow(
@@ -1,28 +1,26 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QScrollArea, QHBoxLayout, QRadioButton,
-    QPushButton, QButtonGroup, QSizePolicy, QGroupBox, QGridLayout, QMessageBox,
+    QWidget, QVBoxLayout, QLabel, QHBoxLayout, QRadioButton,
+    QPushButton, QButtonGroup, QGroupBox, QMessageBox,
     QSplitter, QWidget, QSlider, QDialog, QLineEdit, QComboBox
 )
-from PyQt5.QtCore import Qt, QTimer, QTime
-from PyQt5.QtGui import QPixmap, QImage, QFont, QIntValidator
-import fitz  # PyMuPDF
-from ui.results_window import ResultsWindow
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QIntValidator
 from ui.answer_key_dialog import AnswerKeyDialog
 from ui.pymupdf_selectable_view import SelectablePdfViewer
+from ui.question_palette import QuestionPaletteView
+from ui.exam_clock import ExamClock, format_clock
+import time
 import uuid
 from db import storage
+from db.journal import AttemptJournal, replay_journal
+from utils.file_utils import file_digest
 
-STATE_COLORS = {
-    "not_visited": "#bdbdbd",      # grey
-    "current" : "#f9f9f9",         #white
-    "not_answered": "#e57373",     # red
-    "answered": "#66bb6a",         # green
-    "review": "#7e57c2",           # purple
-}
+# Remaining time is journaled every this many seconds; a resumed test loses at most this much
+JOURNAL_TIMER_SEC = 5
 
 class TestWindow(QWidget):
     def __init__(self, pdf_path, time_limit=60, num_questions=10, exam_type="Other",
-                 marks_per_correct=1.0, negative_mark=0.0):
+                 marks_per_correct=1.0, negative_mark=0.0, attempt_uuid=None, journal=None):
         super().__init__()
         self.exam_type = exam_type
         self.marks_per_correct = float(marks_per_correct)
@@ -38,18 +36,89 @@ class TestWindow(QWidget):
 
         self.question_states = ["not_visited"] * self.num_questions
         self.review_flags = [False] * self.num_questions
-        self.attempt_uuid = str(uuid.uuid4())
+        # Seconds spent on each question, measured on a monotonic clock while it is the current one
+        self.time_spent = [0.0] * self.num_questions
+        self._question_started = time.monotonic()
+        self.attempt_uuid = attempt_uuid or str(uuid.uuid4())
+
+        # Crash-safe autosave; a resumed test keeps appending to the journal it was rebuilt from
+        if journal is None:
+            journal = AttemptJournal.for_attempt(self.attempt_uuid)
+            journal.record("start", window=type(self).__name__, attempt_uuid=self.attempt_uuid,
+                           pdf_path=pdf_path, time_limit=time_limit, num_questions=num_questions,
+                           exam_type=exam_type, marks_per_correct=self.marks_per_correct,
+                           negative_mark=self.negative_mark)
+        self.journal = journal
+        self._journaled = {}  # question index -> (answer, type, state, review) last written
+        self._journaled_nav = None
 
         self.setWindowTitle('Take Test')
         self.setGeometry(150, 150, 1200, 800)
-        self.timer = QTimer(self)
-        hours = self.time_limit // 60
-        minutes = self.time_limit % 60
-        self.time_left = QTime(hours, minutes, 0)
-        self.timer.timeout.connect(self.update_timer)
+        # Counts down to a monotonic deadline; the app-wide tick driver samples it
+        self.clock = ExamClock(self.time_limit * 60, parent=self)
+        self.clock.second_changed.connect(self.update_timer)
+        self._journaled_left = self.time_limit * 60
         self.init_ui(pdf_path)
         self.start_timer()
 
+    @classmethod
+    def from_journal(cls, path, state=None):
+        """
+        Rebuild an unfinished test from its journal (db.journal) and continue journaling into it.
+        `state` is the journal's replay_journal() result, if the caller already has it.
+        """
+        state = state or replay_journal(path)
+        if state is None:
+            return None
+        window = cls(state["pdf_path"], time_limit=state["time_limit"], num_questions=state["num_questions"],
+                     exam_type=state["exam_type"], marks_per_correct=state["marks_per_correct"],
+                     negative_mark=state["negative_mark"], attempt_uuid=state["attempt_uuid"],
+                     journal=AttemptJournal(path))
+        window._restore_state(state)
+        return window
+
+    def _restore_state(self, state):
+        self.answers = state["answers"]
+        self.question_types = state["question_types"]
+        self.question_states = state["question_states"]
+        self.review_flags = state["review_flags"]
+        for i in range(self.num_questions):
+            self._journaled[i] = (self.answers[i], self.question_types[i],
+                                  self.question_states[i], self.review_flags[i])
+        self.time_spent = state["time_spent"]
+        self.current_question = state["current_question"]
+        self._question_started = time.monotonic()
+        self._journaled_nav = self.current_question
+        self.palette_view.palette_model.set_states(self.question_states)
+        self._journaled_left = state["time_left_sec"]
+        self.clock.set_remaining(state["time_left_sec"])
+        self.update_timer()
+        self.update_question_ui()
+
+    def _charge_time(self):
+        # Add the time since the last switch to the current question; returns its new total
+        now = time.monotonic()
+        idx = self.current_question
+        self.time_spent[idx] += now - self._question_started
+        self._question_started = now
+        return self.time_spent[idx]
+
+    def _set_current_question(self, idx):
+        """Make `idx` the current question, charging the elapsed time to the one being left."""
+        if idx == self.current_question:
+            return
+        spent = self._charge_time()
+        self.journal.record("time", i=self.current_question, sec=round(spent, 3))
+        self.current_question = idx
+
+    def _journal_question(self, idx):
+        # Only changes are written; every event carries the question's full state so replay is a plain overwrite
+        snapshot = (self.answers[idx], self.question_types[idx], self.question_states[idx], self.review_flags[idx])
+        if self._journaled.get(idx) != snapshot:
+            self._journaled[idx] = snapshot
+            self.journal.record("q", i=idx, answer=snapshot[0], type=snapshot[1],
+                                state=snapshot[2], review=snapshot[3])
+
     def init_ui(self, pdf_path):
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -89,35 +158,12 @@ class TestWindow(QWidget):
         palette_vbox.setContentsMargins(6, 6, 6, 6)
         palette_vbox.setSpacing(8)
 
-        # Scroll area to hold palette grid
-        self.palette_scroll = QScrollArea()
-        self.palette_scroll.setWidgetResizable(True)
-        self.palette_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.palette_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        # Model/delegate grid: no widget per question, only visible chips are laid out and painted
+        self.palette_view = QuestionPaletteView(self.question_states)
         # Show about ~6 rows at a time (adjust as desired)
-        self.palette_scroll.setFixedHeight(240)
-
-        # Content widget for grid
-        palette_content = QWidget()
-        self.palette_grid = QGridLayout()
-        self.palette_grid.setContentsMargins(4, 4, 4, 4)
-        self.palette_grid.setHorizontalSpacing(6)
-        self.palette_grid.setVerticalSpacing(6)
-        palette_content.setLayout(self.palette_grid)
-        self.palette_scroll.setWidget(palette_content)
-
-        self.question_palette = []
-        questions_per_row = 5
-        for i in range(self.num_questions):
-            btn = QPushButton(str(i + 1))
-            btn.setCheckable(True)
-            btn.setFixedSize(40, 36)
-            btn.setFont(QFont("Arial", 12, QFont.Bold))
-            btn.clicked.connect(lambda checked, idx=i: self.go_to_question(idx))
-            self.palette_grid.addWidget(btn, i // questions_per_row, i % questions_per_row)
-            self.question_palette.append(btn)
-
-        palette_vbox.addWidget(self.palette_scroll)
+        self.palette_view.setFixedHeight(240)
+        self.palette_view.question_clicked.connect(self.go_to_question)
+        palette_vbox.addWidget(self.palette_view)
 
         legend = QLabel(
             "● <span style='color:#bdbdbd'>Not Visited</span>   "
@@ -256,7 +302,7 @@ class TestWindow(QWidget):
         self.review_flags[self.current_question] = False
         self._update_state_for_current()
         if self.current_question < self.num_questions - 1:
-            self.current_question += 1
+            self._set_current_question(self.current_question + 1)
         self.update_question_ui()
 
     def save_and_mark_for_review(self):
@@ -271,7 +317,7 @@ class TestWindow(QWidget):
         self.question_states[self.current_question] = "review"
         self.update_question_ui()
         if self.current_question < self.num_questions - 1:
-            self.current_question += 1
+            self._set_current_question(self.current_question + 1)
             self.update_question_ui()
 
     def clear_response(self):
@@ -293,27 +339,38 @@ class TestWindow(QWidget):
         self.review_flags[self.current_question] = False
         if not self.question_states[self.current_question] == "review":
             self._update_state_for_current()
-        self.current_question = idx
+        self._journal_question(self.current_question)
+        self._set_current_question(idx)
         self.update_question_ui()
 
     def start_timer(self):
-        self.timer.start(1000)
+        self.clock.start()
 
     def update_timer(self):
-        if self.time_left == QTime(0, 0, 0):
+        # The label is recomputed from the clock's deadline, so missed ticks cost no exam time
+        left = self.clock.seconds_left()
+        if left == 0:
             self.timer_label.setText("Time's up!")
-            self.timer.stop()
+            self.clock.stop()
             self.submit_test(auto=True)
             self.disable_test_ui()
         else:
-            self.timer_label.setText(f"Time left: {self.time_left.toString('hh:mm:ss')}")
-            self.time_left = self.time_left.addSecs(-1)
+            self.timer_label.setText(f"Time left: {format_clock(left)}")
+            # Ticks can skip seconds after a stall, so journal by elapsed time rather than on multiples
+            if self._journaled_left - left >= JOURNAL_TIMER_SEC:
+                self._journaled_left = left
+                self.journal.record("timer", left=left)
+                self.journal.record("time", i=self.current_question, sec=round(self._charge_time(), 3))
 
     def disable_test_ui(self):
         for btn in self.options:
             btn.setEnabled(False)
 
     def update_question_ui(self):
+        self._journal_question(self.current_question)
+        if self._journaled_nav != self.current_question:
+            self._journaled_nav = self.current_question
+            self.journal.record("nav", i=self.current_question)
         self.question_number_label.setText(f"Question {self.current_question + 1} of {self.num_questions}")
 
         # Set type selector from per-question type
@@ -343,27 +400,20 @@ class TestWindow(QWidget):
                 self.text_input.setText(str(current.get("value", "")))
         self.numeric_input.blockSignals(False); self.text_input.blockSignals(False)
 
-        # Palette styling
-        for idx, btn in enumerate(self.question_palette):
-            color = STATE_COLORS[self.question_states[idx]]
-            border_width = "2px" if idx == self.current_question else "1px"
-            border_color = "#000" if idx == self.current_question else "#888"
-            btn.setStyleSheet(
-                f"background-color: {color}; border-radius: 15px; font-weight: bold; "
-                f"border-width: {border_width}; border-style: solid; border-color: {border_color};"
-            )
-            btn.setChecked(idx == self.current_question)
+        # Palette: states only change on the current question, so repainting the previous and the
+        # new current chip is enough
+        self.palette_view.show_current(self.current_question)
 
     def next_question(self):
         self.save_current_answer()
         if self.current_question < self.num_questions - 1:
-            self.current_question += 1
+            self._set_current_question(self.current_question + 1)
             self.update_question_ui()
 
     def prev_question(self):
         self.save_current_answer()
         if self.current_question > 0:
-            self.current_question -= 1
+            self._set_current_question(self.current_question - 1)
             self.update_question_ui()
 
     def save_current_answer(self):
@@ -423,6 +473,7 @@ class TestWindow(QWidget):
             # Any non-None answer counts as answered
             if not self.review_flags[self.current_question]:
                 self.question_states[self.current_question] = "answered"
+        self._journal_question(self.current_question)
 
     def submit_test(self, auto=False):
         self.save_current_answer()
@@ -440,49 +491,57 @@ class TestWindow(QWidget):
             if reply != QMessageBox.Yes:
                 return
 
-        self.timer.stop()
+        self.clock.stop()
+        self._charge_time()
         self.disable_test_ui()
         
         initial_time_seconds = self.time_limit * 60
-        remaining_time_seconds = self.time_left.hour() * 3600 + self.time_left.minute() * 60 + self.time_left.second()
+        remaining_time_seconds = self.clock.seconds_left()
         time_taken_seconds = initial_time_seconds - remaining_time_seconds
         
         answer_dialog = AnswerKeyDialog(self.num_questions, self, question_types=self.question_types)
         if answer_dialog.exec_() == QDialog.Accepted:
             correct_answers, method = answer_dialog.get_answers()
             # correct_answers is now a list of dicts: {"type": "...", "value": ...}
-            # For DB logging, store only MCQ indices (others None):
-            correct_idx = [ca["value"] if isinstance(ca, dict) and ca.get("type") == "mcq" else None
-                           for ca in correct_answers]
-            # use correct_idx for DB storage; keep full correct_answers for future results processing
-
-            # Log to DB: only MCQ selected_answer fits current schema; numeric/text logged as None for selected_answer
+            # Every answer type is logged: storage splits the records into typed columns
             try:
+                rows = []
                 for i in range(self.num_questions):
                     sel = self.answers[i] if i < len(self.answers) else None
-                    if isinstance(sel, dict) and sel.get("type") == "mcq":
-                        selected_value = sel.get("value", None)
-                    else:
-                        selected_value = None  # extend schema later for numeric/text if desired
                     correct = correct_answers[i] if i < len(correct_answers) else None
                     hint_count = 0
                     if hasattr(self, "hints_used"):
                         hint_count = getattr(self, "hints_used", {}).get(i, 0) or 0
-                    storage.log_attempt(
-                        attempt_uuid=self.attempt_uuid,
-                        question_index=i,
-                        selected_answer=selected_value,
-                        correct_answer=correct,
-                        time_spent_sec=0,
-                        hint_count=hint_count
-                    )
+                    rows.append({
+                        "attempt_uuid": self.attempt_uuid,
+                        "question_index": i,
+                        "selected_answer": sel,
+                        "correct_answer": correct,
+                        "time_spent_sec": int(round(self.time_spent[i])),
+                        "hint_count": hint_count,
+                    })
+                session = {
+                    "attempt_uuid": self.attempt_uuid,
+                    "exam_type": self.exam_type,
+                    "pdf_hash": self._pdf_hash(),
+                    "num_questions": self.num_questions,
+                    "time_limit_min": self.time_limit,
+                    "marks_per_correct": self.marks_per_correct,
+                    "negative_mark": self.negative_mark,
+                }
+                # One connection and one transaction for the whole attempt
+                storage.log_attempts(rows, session=session)
             except Exception:
                 pass
+            # Submitted: nothing left to resume
+            self.journal.discard()
 
             if method == "skip":
                 self.close()
                 return
 
+            # Imported here: the results views pull in numpy and openai, which startup does not need
+            from ui.results_window import ResultsWindow
             self.results_window = ResultsWindow(
                 answers=self.answers,
                 correct_answers=correct_answers,
@@ -491,31 +550,32 @@ class TestWindow(QWidget):
                 marks_per_correct=self.marks_per_correct,
                 negative_mark=self.negative_mark,
                 exam_type=self.exam_type,
-                pdf_path=self.pdf_path
+                pdf_path=self.pdf_path,
+                attempt_uuid=self.attempt_uuid
             )
             self.results_window.show()
         else:
+            self.journal.discard()
             QMessageBox.information(self, "Test Completed", "Your test has been submitted successfully!")
         self.close()
 
-    def render_pdf_pages(self, zoom_factor):
-        # Remove old widgets
-        for i in reversed(range(self.pdf_vbox.count())):
-            widget = self.pdf_vbox.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        if not self.pdf_path:
-            return
-        doc = fitz.open(self.pdf_path)
-        for page_num in range(doc.page_count):
-            page = doc.load_page(page_num)
-            matrix = fitz.Matrix(zoom_factor / 100, zoom_factor / 100)
-            pix = page.get_pixmap(matrix=matrix)
-            img_format = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
-            img = QImage(bytes(pix.samples), pix.width, pix.height, pix.stride, img_format)
-            lbl = QLabel()
-            lbl.setPixmap(QPixmap.fromImage(img))
-            lbl.setAlignment(Qt.AlignCenter)
-            lbl.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            self.pdf_vbox.addWidget(lbl)
-        doc.close()
+    def _pdf_hash(self):
+        # The viewer's render service already hashes the paper for its page cache
+        try:
+            if hasattr(self, "pdf_viewer"):
+                return self.pdf_viewer.render_service.document_key()
+            return file_digest(self.pdf_path)
+        except OSError:
+            return None
+
+    def closeEvent(self, event):
+        # Stop background page rendering along with the window
+        if hasattr(self, "pdf_viewer"):
+            self.pdf_viewer.close_document()
+        # An unsubmitted test keeps its journal so it can be resumed later, with the time left and
+        # the time spent on the open question up to now
+        self.clock.stop()
+        self.journal.record("timer", left=self.clock.seconds_left())
+        self.journal.record("time", i=self.current_question, sec=round(self._charge_time(), 3))
+        self.journal.close()
+        super().closeEvent(event)
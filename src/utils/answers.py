@@ -0,0 +1,170 @@
+import math
+from fractions import Fraction
+
+MCQ_MAP_IDX_TO_LETTER = {0: "A", 1: "B", 2: "C", 3: "D"}
+MCQ_MAP_LETTER_TO_IDX = {"A": 0, "B": 1, "C": 2, "D": 3}
+
+def normalize_answer_item(item):
+    """
+    Normalize an answer record to {"type": "mcq"|"numeric"|"text", "value": ...} or None.
+    Accepts legacy formats: None, int (MCQ index), or string.
+    """
+    if item is None:
+        return None
+
+    # Already structured
+    if isinstance(item, dict) and "type" in item:
+        t = str(item.get("type", "")).lower()
+        v = item.get("value", None)
+        if t == "mcq":
+            # Normalize mcq value to 0..3
+            if isinstance(v, int):
+                return {"type": "mcq", "value": v if 0 <= v <= 3 else None}
+            if isinstance(v, str):
+                s = v.strip().upper()
+                if s in MCQ_MAP_LETTER_TO_IDX:
+                    return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX[s]}
+                # try first char
+                return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX.get(s[:1], None)}
+            return {"type": "mcq", "value": None}
+        if t == "numeric":
+            # Keep string form; strip spaces
+            if v is None:
+                return {"type": "numeric", "value": None}
+            return {"type": "numeric", "value": str(v).strip()}
+        if t == "text":
+            if v is None:
+                return {"type": "text", "value": None}
+            return {"type": "text", "value": str(v).strip()}
+        # Unknown type -> None
+        return None
+
+    # Legacy: int -> MCQ index
+    if isinstance(item, int):
+        return {"type": "mcq", "value": item if 0 <= item <= 3 else None}
+    # Legacy: string value (assume text)
+    if isinstance(item, str):
+        s = item.strip()
+        # If single letter A-D, treat as MCQ
+        if len(s) == 1 and s.upper() in MCQ_MAP_LETTER_TO_IDX:
+            return {"type": "mcq", "value": MCQ_MAP_LETTER_TO_IDX[s.upper()]}
+    return {"type": "text", "value": item} if isinstance(item, str) else None
+
+def display_value(item):
+    """Return a user-friendly string for table display."""
+    if item is None:
+        return "--"
+    t = item.get("type")
+    v = item.get("value")
+    if v is None:
+        return "--"
+    if t == "mcq":
+        return MCQ_MAP_IDX_TO_LETTER.get(v, "--")
+    return str(v)
+
+def parse_numeric(s):
+    """Parse numeric string to float; supports integers, decimals, and simple fractions like 1/3."""
+    if s is None:
+        return None
+    s = str(s).strip().replace(" ", "")
+    if s == "":
+        return None
+    try:
+        if "/" in s:
+            # Handle simple fraction a/b (no mixed numbers)
+            return float(Fraction(s))
+        return float(s)
+    except Exception:
+        return None
+
+def compare_answers(user_item, correct_item, numeric_tol=1e-3):
+    """
+    Compare user vs correct.
+    Returns (is_attempted, is_correct, has_correct_key).
+    - is_attempted: user has a non-None value
+    - is_correct: based on type-specific comparison
+    - has_correct_key: correct key exists (type+value present)
+    """
+    u = normalize_answer_item(user_item)
+    c = normalize_answer_item(correct_item)
+
+    # Attempted?
+    is_attempted = (u is not None and u.get("value") is not None)
+
+    # Correct key presence?
+    has_correct_key = (c is not None and c.get("value") is not None)
+
+    # If user not attempted, incorrect by definition (for stats), no score change
+    if not is_attempted:
+        return False, False, has_correct_key
+
+    # If no correct key provided, we can't judge correctness.
+    if not has_correct_key:
+        return True, False, False
+
+    ut, uv = u.get("type"), u.get("value")
+    ct, cv = c.get("type"), c.get("value")
+
+    # If types mismatch, treat as incorrect
+    if ut != ct:
+        return True, False, True
+
+    if ut == "mcq":
+        return True, (uv == cv), True
+
+    if ut == "numeric":
+        u_num = parse_numeric(uv)
+        c_num = parse_numeric(cv)
+        if u_num is None or c_num is None:
+            # Fall back to string match if parsing fails
+            return True, (str(uv).strip() == str(cv).strip()), True
+        # Absolute or relative tolerance
+        if math.isclose(u_num, c_num, rel_tol=1e-6, abs_tol=numeric_tol):
+            return True, True, True
+        return True, False, True
+
+    if ut == "text":
+        # Case-insensitive, collapse whitespace
+        u_norm = " ".join(str(uv).split()).strip().lower()
+        c_norm = " ".join(str(cv).split()).strip().lower()
+        return True, (u_norm == c_norm), True
+
+    return True, False, True
+
+
+def encode_answer(item):
+    """
+    Split an answer into typed storage columns: (type, value, numeric).
+    value is the canonical text form (A-D for MCQ); numeric is the parsed number for numeric answers.
+    All three are None for a missing answer.
+    """
+    a = normalize_answer_item(item)
+    if a is None:
+        return None, None, None
+    t, v = a["type"], a.get("value")
+    if v is None:
+        return t, None, None
+    if t == "mcq":
+        return t, MCQ_MAP_IDX_TO_LETTER[v], None
+    if t == "numeric":
+        return t, v, parse_numeric(v)
+    return t, v, None
+
+def decode_answer(answer_type, value):
+    """Inverse of encode_answer: rebuild the {"type", "value"} record from stored columns."""
+    if answer_type is None:
+        return None
+    return normalize_answer_item({"type": answer_type, "value": value})
+
+def grade_answer(user_item, correct_item, marks_per_correct=None, negative_mark=None):
+    """
+    Return (is_correct, marks) for one question.
+    is_correct is None when the question was skipped or has no key; marks is None when no marking
+    scheme is given. negative_mark is added as-is for a wrong answer (it is stored as a negative number).
+    """
+    is_attempted, is_correct, has_key = compare_answers(user_item, correct_item)
+    if not (is_attempted and has_key):
+        return None, (0.0 if marks_per_correct is not None else None)
+    if marks_per_correct is None:
+        return is_correct, None
+    return is_correct, (marks_per_correct if is_correct else (negative_mark or 0.0))
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+import time
+
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cache")
+
+
+class DiskCache:
+    """
+    Content-addressed byte cache on disk with a total size cap and LRU eviction.
+    Entries live under `root` as files named by the SHA-1 of their key; a file's mtime records
+    its last use, so recency survives restarts. Safe to share between threads.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # path -> [size, last_used], built lazily from the directory
+        self._total = 0
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, name[:2], name)
+
+    def _load_index(self):
+        # Called with the lock held
+        if self._index is not None:
+            return
+        self._index = {}
+        self._total = 0
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _dirs, files in os.walk(self.root):
+            for fname in files:
+                path = os.path.join(dirpath, fname)
+                if fname.endswith(".tmp"):
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self._index[path] = [st.st_size, st.st_mtime]
+                self._total += st.st_size
+
+    def get(self, key):
+        """Return the cached bytes for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self._load_index()
+            entry = self._index.get(path)
+            if entry is not None:
+                entry[1] = now
+        return data
+
+    def put(self, key, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so readers never see a partial entry
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._load_index()
+            old = self._index.get(path)
+            if old is not None:
+                self._total -= old[0]
+            self._index[path] = [len(data), time.time()]
+            self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict(keep=path)
+
+    def delete(self, key):
+        """Remove the entry for `key`, if any."""
+        path = self._path(key)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._load_index()
+            entry = self._index.pop(path, None)
+            if entry is not None:
+                self._total -= entry[0]
+
+    def _evict(self, keep=None):
+        # Drop least recently used entries until the cache is back under its cap
+        for path, (size, _used) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._index[path]
+            self._total -= size
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def clear(self):
+        with self._lock:
+            self._load_index()
+            for path in list(self._index):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._index = {}
+            self._total = 0
@@ -1,3 +1,5 @@
+import hashlib
+
 def upload_pdf(file_path):
     """Uploads a PDF file to the application."""
     # Implement the logic to upload the PDF file
@@ -16,4 +18,12 @@ def read_pdf(file_path):
 def delete_file(file_path):
     """Deletes a specified file."""
     # Implement the logic to delete a file
-    pass
\ No newline at end of file
+    pass
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,5 @@
+import threading
+
+# PyMuPDF is not thread-safe: every thread that opens, reads, renders or closes a fitz document
+# (the page render thread, the answer key extractor, topic analysis, viewer setup) holds this lock while doing so
+FITZ_LOCK = threading.Lock()
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import time
+from utils.disk_cache import DiskCache, CACHE_ROOT
+
+# Chat completion texts, shared by every OpenAI-backed worker and kept across sessions
+OPENAI_CACHE_DIR = os.path.join(CACHE_ROOT, "openai")
+OPENAI_CACHE_BYTES = 64 * 1024 * 1024
+# Answers older than this are asked for again
+OPENAI_CACHE_TTL_SEC = 30 * 24 * 3600
+_openai_cache = None
+
+
+def openai_disk_cache() -> DiskCache:
+    """Shared on-disk cache of OpenAI responses."""
+    global _openai_cache
+    if _openai_cache is None:
+        _openai_cache = DiskCache(OPENAI_CACHE_DIR, OPENAI_CACHE_BYTES)
+    return _openai_cache
+
+
+def request_key(model, messages, params) -> str:
+    """Cache key of a chat completion request: model plus a hash of the prompt and parameters."""
+    body = json.dumps({"messages": messages, "params": params}, sort_keys=True, separators=(",", ":"))
+    return f"chat:{model}:{hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+
+
+def chat_completion_text(model, messages, api_key=None, cache=None, ttl=OPENAI_CACHE_TTL_SEC, **params):
+    """
+    Content of the first choice of openai.chat.completions.create(model=..., messages=..., **params).
+    An identical request answered within `ttl` seconds is served from the disk cache without an API
+    call; openai is only imported, and `api_key` (if given) only set, on a miss. Errors propagate and
+    empty answers are not cached. The key is not part of the cache key.
+    """
+    cache = cache if cache is not None else openai_disk_cache()
+    key = request_key(model, messages, params)
+    raw = cache.get(key)
+    if raw is not None:
+        try:
+            entry = json.loads(raw)
+            if time.time() - entry["created"] <= ttl:
+                return entry["content"]
+        except (ValueError, KeyError, TypeError):
+            pass
+        cache.delete(key)
+
+    import openai
+    if api_key:
+        openai.api_key = api_key
+    response = openai.chat.completions.create(model=model, messages=messages, **params)
+    content = response.choices[0].message.content
+    if content:
+        entry = {"created": time.time(), "model": model, "content": content}
+        cache.put(key, json.dumps(entry).encode("utf-8"))
+    return content
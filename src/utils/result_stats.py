@@ -0,0 +1,97 @@
+from collections import OrderedDict, namedtuple
+from utils.answers import normalize_answer_item, display_value, encode_answer
+from utils.scoring import score_answers
+
+# Stats of recently opened attempts; reopening results or the paper analysis reuses them
+STATS_CACHE_SIZE = 16
+_cache = OrderedDict()
+
+# One row of the question-wise table
+QuestionRow = namedtuple("QuestionRow", "index type user_display correct_display attempted correct has_key marks")
+
+
+class ResultStats:
+    """
+    Everything the results views show for one attempt, computed once: totals, score, a per-question
+    table and per-type accuracy. Pure data (no Qt); obtain instances through get_result_stats().
+    """
+
+    def __init__(self, answers, correct_answers, marks_per_correct=1.0, negative_mark=0.0):
+        answers = list(answers or [])
+        n = len(answers)
+        key = list(correct_answers or [])[:n]
+        key += [None] * (n - len(key))
+        self.marks_per_correct = float(marks_per_correct)
+        self.negative_mark = float(negative_mark)
+
+        result = score_answers(answers, key, self.marks_per_correct, self.negative_mark)
+        self.num_questions = n
+        self.attempted = int(result.attempted_count)
+        self.correct = int(result.correct_count)
+        self.incorrect = int(result.incorrect_count)
+        self.incorrect_scored = int(result.incorrect_scored_count)
+        self.not_attempted = int(result.not_attempted_count)
+        self.questions_with_key = int(result.questions_with_key)
+        self.overall_accuracy = float(result.overall_accuracy)
+        self.attempted_accuracy = float(result.attempted_accuracy)
+        self.score = float(result.score)
+        self.max_score = float(result.max_score)  # simple max assuming uniform marks
+        self.negative_total = self.incorrect_scored * abs(self.negative_mark)
+
+        marks = result.marks().tolist()
+        attempted = result.attempted.tolist()
+        correct = result.correct.tolist()
+        has_key = result.has_key.tolist()
+        rows = []
+        for i in range(n):
+            u_item = normalize_answer_item(answers[i])
+            c_item = normalize_answer_item(key[i])
+            typ = (u_item or c_item or {"type": None}).get("type")
+            rows.append(QuestionRow(i, typ, display_value(u_item), display_value(c_item),
+                                    attempted[i], correct[i], has_key[i], marks[i]))
+        self.rows = tuple(rows)
+
+        self.by_type = result.by_type()
+        for stats in self.by_type.values():
+            stats["accuracy"] = (stats["correct"] / stats["attempted"] * 100.0) if stats["attempted"] else 0.0
+
+    @property
+    def pie_counts(self):
+        """(correct, wrong, not attempted), the order the results donut chart uses."""
+        return self.correct, self.incorrect, self.not_attempted
+
+
+def _cache_key(answers, correct_answers, marks_per_correct, negative_mark, attempt_uuid):
+    marking = (float(marks_per_correct), float(negative_mark))
+    if attempt_uuid is not None:
+        return ("attempt", attempt_uuid) + marking
+    # No attempt id: key on the canonical answers themselves
+    return (tuple(encode_answer(a) for a in answers or []),
+            tuple(encode_answer(c) for c in correct_answers or [])) + marking
+
+
+def get_result_stats(answers, correct_answers, marks_per_correct=1.0, negative_mark=0.0, attempt_uuid=None):
+    """
+    Return the memoized ResultStats for an attempt, computing it on first use.
+    With `attempt_uuid` the attempt id (plus marking scheme) is the cache key, so callers must
+    pass a new id, or call invalidate_result_stats(), when answers or key change.
+    """
+    key = _cache_key(answers, correct_answers, marks_per_correct, negative_mark, attempt_uuid)
+    stats = _cache.get(key)
+    if stats is not None:
+        _cache.move_to_end(key)
+        return stats
+    stats = ResultStats(answers, correct_answers, marks_per_correct, negative_mark)
+    _cache[key] = stats
+    while len(_cache) > STATS_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return stats
+
+
+def invalidate_result_stats(attempt_uuid=None):
+    """Drop cached stats for one attempt id, or everything."""
+    if attempt_uuid is None:
+        _cache.clear()
+        return
+    for key in [k for k in _cache if k[:2] == ("attempt", attempt_uuid)]:
+        del _cache[key]
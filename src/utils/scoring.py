@@ -0,0 +1,182 @@
+import numpy as np
+from utils.answers import MCQ_MAP_LETTER_TO_IDX, normalize_answer_item, parse_numeric
+
+# Type codes of the columnar answer form; NONE also covers a typed answer with no value
+TYPE_NONE = 0
+TYPE_MCQ = 1
+TYPE_NUMERIC = 2
+TYPE_TEXT = 3
+TYPE_NAMES = {TYPE_MCQ: "mcq", TYPE_NUMERIC: "numeric", TYPE_TEXT: "text"}
+_TYPE_CODES = {name: code for code, name in TYPE_NAMES.items()}
+
+NUMERIC_ABS_TOL = 1e-3
+NUMERIC_REL_TOL = 1e-6
+
+
+class AnswerColumns:
+    """
+    Answers (or a key) in columnar form, one entry per question:
+      types:   int8 type code
+      mcq:     MCQ index 0..3, -1 if not an answered MCQ
+      numeric: parsed float, NaN if not a parseable numeric answer
+      text:    comparison string (stripped for numeric, case/whitespace folded for text), "" otherwise
+    Every item is normalized and parsed once here; grading then works on whole arrays.
+    Columns may be 2-D (attempts x questions) to grade many attempts at once.
+    """
+    __slots__ = ("types", "mcq", "numeric", "text")
+
+    def __init__(self, types, mcq, numeric, text):
+        self.types = np.asarray(types, dtype=np.int8)
+        self.mcq = np.asarray(mcq, dtype=np.int8)
+        self.numeric = np.asarray(numeric, dtype=np.float64)
+        self.text = np.asarray(text, dtype=object)
+
+    @classmethod
+    def from_items(cls, items):
+        """Build from answer records ({"type", "value"}, legacy MCQ index, string or None)."""
+        n = len(items)
+        types = np.zeros(n, dtype=np.int8)
+        mcq = np.full(n, -1, dtype=np.int8)
+        numeric = np.full(n, np.nan)
+        text = np.full(n, "", dtype=object)
+        for i, item in enumerate(items):
+            a = normalize_answer_item(item)
+            if a is None or a.get("value") is None:
+                continue
+            t, v = a["type"], a["value"]
+            types[i] = _TYPE_CODES[t]
+            if t == "mcq":
+                mcq[i] = v
+            elif t == "numeric":
+                num = parse_numeric(v)
+                if num is not None:
+                    numeric[i] = num
+                text[i] = str(v).strip()
+            else:
+                text[i] = " ".join(str(v).split()).lower()
+        return cls(types, mcq, numeric, text)
+
+    @classmethod
+    def from_stored(cls, types, values, numerics):
+        """
+        Build from the typed attempt columns (answer_type, selected_value, selected_numeric), which
+        already hold canonical values (see utils.answers.encode_answer), so nothing is re-parsed.
+        """
+        n = len(types)
+        codes = np.fromiter((_TYPE_CODES.get(t, TYPE_NONE) if v is not None else TYPE_NONE
+                             for t, v in zip(types, values)), dtype=np.int8, count=n)
+        mcq = np.fromiter((MCQ_MAP_LETTER_TO_IDX.get(v, -1) if t == "mcq" else -1
+                           for t, v in zip(types, values)), dtype=np.int8, count=n)
+        numeric = np.fromiter((np.nan if x is None else x for x in numerics), dtype=np.float64, count=n)
+        text = np.empty(n, dtype=object)
+        text[:] = [" ".join(v.split()).lower() if t == "text" and v is not None
+                   else (v if t == "numeric" and v is not None else "")
+                   for t, v in zip(types, values)]
+        return cls(codes, mcq, numeric, text)
+
+    @classmethod
+    def stack(cls, columns):
+        """Stack equally long AnswerColumns into one 2-D AnswerColumns."""
+        return cls(np.stack([c.types for c in columns]), np.stack([c.mcq for c in columns]),
+                   np.stack([c.numeric for c in columns]), np.stack([c.text for c in columns]))
+
+    def __len__(self):
+        return self.types.shape[-1]
+
+
+def grade(user: AnswerColumns, key: AnswerColumns, numeric_tol=NUMERIC_ABS_TOL):
+    """
+    Element-wise grading with the same rules as utils.answers.compare_answers.
+    Returns boolean arrays (attempted, correct, has_key) shaped like the inputs; `key` broadcasts
+    against `user`, so one key can grade a stack of attempts.
+    """
+    attempted = user.types != TYPE_NONE
+    has_key = key.types != TYPE_NONE
+    same_type = attempted & has_key & (user.types == key.types)
+
+    mcq_ok = (user.types == TYPE_MCQ) & (user.mcq == key.mcq)
+
+    # Numbers compare like math.isclose; when either side does not parse, the stripped strings compare
+    both_parsed = ~np.isnan(user.numeric) & ~np.isnan(key.numeric)
+    with np.errstate(invalid="ignore"):
+        diff = np.abs(user.numeric - key.numeric)
+        limit = np.maximum(NUMERIC_REL_TOL * np.maximum(np.abs(user.numeric), np.abs(key.numeric)), numeric_tol)
+        close = diff <= limit
+    text_eq = user.text == key.text
+    numeric_ok = (user.types == TYPE_NUMERIC) & np.where(both_parsed, close, text_eq)
+
+    text_ok = (user.types == TYPE_TEXT) & text_eq
+
+    correct = same_type & (mcq_ok | numeric_ok | text_ok)
+    return attempted, correct, np.broadcast_to(has_key, attempted.shape)
+
+
+class ScoreResult:
+    """Per-question grading arrays plus summary totals (over the last axis) for one or many attempts."""
+
+    def __init__(self, attempted, correct, has_key, types, marks_per_correct, negative_mark):
+        self.attempted = attempted
+        self.correct = correct
+        self.has_key = has_key
+        # Wrong answers only cost marks when a key exists to judge them
+        self.wrong_scored = attempted & has_key & ~correct
+        self.types = types
+        self.marks_per_correct = marks_per_correct
+        self.negative_mark = negative_mark
+
+        self.num_questions = attempted.shape[-1]
+        self.attempted_count = attempted.sum(axis=-1)
+        self.correct_count = correct.sum(axis=-1)
+        self.incorrect_count = self.attempted_count - self.correct_count
+        self.incorrect_scored_count = self.wrong_scored.sum(axis=-1)
+        self.not_attempted_count = self.num_questions - self.attempted_count
+        self.questions_with_key = has_key.sum(axis=-1)
+        self.score = self.correct_count * marks_per_correct + self.incorrect_scored_count * negative_mark
+        self.max_score = self.num_questions * marks_per_correct
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n = max(self.num_questions, 1)
+            self.overall_accuracy = self.correct_count / n * 100.0
+            self.attempted_accuracy = np.where(self.attempted_count > 0,
+                                               self.correct_count / np.maximum(self.attempted_count, 1) * 100.0,
+                                               0.0)
+
+    def marks(self):
+        """Marks earned per question."""
+        return np.where(self.correct, self.marks_per_correct, np.where(self.wrong_scored, self.negative_mark, 0.0))
+
+    def by_type(self):
+        """
+        {type name: {"questions", "attempted", "correct", "wrong"}} counted over every axis.
+        A question's type is the user's answer type, or the key's when it was skipped.
+        """
+        stats = {}
+        for code, name in TYPE_NAMES.items():
+            mask = self.types == code
+            total = int(mask.sum())
+            if total == 0:
+                continue
+            stats[name] = {
+                "questions": total,
+                "attempted": int((mask & self.attempted).sum()),
+                "correct": int((mask & self.correct).sum()),
+                "wrong": int((mask & self.attempted & ~self.correct).sum()),
+            }
+        return stats
+
+
+def score_columns(user: AnswerColumns, key: AnswerColumns, marks_per_correct=1.0, negative_mark=0.0,
+                  numeric_tol=NUMERIC_ABS_TOL) -> ScoreResult:
+    """Grade columnar answers against a key in one vectorized pass."""
+    attempted, correct, has_key = grade(user, key, numeric_tol)
+    types = np.where(user.types != TYPE_NONE, user.types, np.broadcast_to(key.types, user.types.shape))
+    return ScoreResult(attempted, correct, has_key, types, float(marks_per_correct), float(negative_mark))
+
+
+def score_answers(answers, correct_answers, marks_per_correct=1.0, negative_mark=0.0,
+                  numeric_tol=NUMERIC_ABS_TOL) -> ScoreResult:
+    """Convenience wrapper: grade one attempt given as lists of answer records."""
+    n = len(answers)
+    key = list(correct_answers or [])[:n]
+    key += [None] * (n - len(key))
+    return score_columns(AnswerColumns.from_items(answers), AnswerColumns.from_items(key),
+                         marks_per_correct, negative_mark, numeric_tol)
@@ -0,0 +1,72 @@
+import builtins
+import sys
+import threading
+import time
+
+# Modules listed in the report, slowest first
+REPORT_TOP = 20
+
+
+class ImportProfiler:
+    """
+    Times every module imported (for the first time) on the main thread while installed.
+    Records inclusive time (the module plus what it imports) and self time per module, like
+    `python -X importtime`, but from inside the app so the cost is seen next to time-to-first-window.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.inclusive = {}
+        self.self_time = {}
+        self._stack = []  # [name, start, time spent in nested imports]
+        self._original = None
+        self._thread = threading.get_ident()
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative imports, packages already loaded (so `from pkg import submodule` too) and other
+        # threads' imports pass straight through; their cost lands in the enclosing module's self time
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original(name, globals, locals, fromlist, level)
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.inclusive[name] = self.inclusive.get(name, 0.0) + elapsed
+            self.self_time[name] = self.self_time.get(name, 0.0) + elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def by_package(self):
+        """Self time summed per top-level package, e.g. {"openai": 0.9, "fitz": 0.1}."""
+        totals = {}
+        for name, sec in self.self_time.items():
+            top = name.partition(".")[0]
+            totals[top] = totals.get(top, 0.0) + sec
+        return totals
+
+    def report(self, milestones, out=None, top=REPORT_TOP):
+        """Write milestone times (name, perf_counter value) and the slowest imports to `out`."""
+        out = out or sys.stderr
+        out.write("Startup profile\n")
+        for label, at in milestones:
+            out.write(f"  {label:<28}{(at - self.started) * 1000:9.1f} ms\n")
+        out.write(f"\nSlowest imports (of {len(self.inclusive)}), inclusive / self ms:\n")
+        for name in sorted(self.inclusive, key=self.inclusive.get, reverse=True)[:top]:
+            out.write(f"  {self.inclusive[name] * 1000:9.1f} {self.self_time[name] * 1000:9.1f}  {name}\n")
+        out.write("\nImport time by package, self ms:\n")
+        packages = self.by_package()
+        for name in sorted(packages, key=packages.get, reverse=True)[:top]:
+            out.write(f"  {packages[name] * 1000:9.1f}  {name}\n")
+        out.flush()
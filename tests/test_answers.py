@@ -0,0 +1,60 @@
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.answers import encode_answer, decode_answer, grade_answer
+
+
+class TestEncodeAnswer:
+    """Test splitting answers into typed storage columns."""
+
+    def test_none(self):
+        assert encode_answer(None) == (None, None, None)
+
+    def test_mcq(self):
+        assert encode_answer({"type": "mcq", "value": 2}) == ("mcq", "C", None)
+
+    def test_legacy_mcq_index(self):
+        assert encode_answer(0) == ("mcq", "A", None)
+
+    def test_numeric(self):
+        t, v, n = encode_answer({"type": "numeric", "value": " 1/4 "})
+        assert (t, v) == ("numeric", "1/4")
+        assert n == 0.25
+
+    def test_unparseable_numeric(self):
+        assert encode_answer({"type": "numeric", "value": "abc"}) == ("numeric", "abc", None)
+
+    def test_text(self):
+        assert encode_answer({"type": "text", "value": "Sodium"}) == ("text", "Sodium", None)
+
+    def test_typed_but_unanswered(self):
+        assert encode_answer({"type": "numeric", "value": None}) == ("numeric", None, None)
+
+    def test_round_trip(self):
+        for item in ({"type": "mcq", "value": 3}, {"type": "numeric", "value": "2.5"},
+                     {"type": "text", "value": "NaCl"}):
+            t, v, _n = encode_answer(item)
+            assert decode_answer(t, v) == item
+        assert decode_answer(None, None) is None
+
+
+class TestGradeAnswer:
+    """Test per-question correctness and marks."""
+
+    def test_correct(self):
+        assert grade_answer({"type": "mcq", "value": 1}, {"type": "mcq", "value": 1}, 4.0, -1.0) == (True, 4.0)
+
+    def test_wrong(self):
+        assert grade_answer({"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}, 4.0, -1.0) == (False, -1.0)
+
+    def test_skipped(self):
+        assert grade_answer(None, {"type": "mcq", "value": 1}, 4.0, -1.0) == (None, 0.0)
+
+    def test_no_key(self):
+        assert grade_answer({"type": "mcq", "value": 1}, None, 4.0, -1.0) == (None, 0.0)
+
+    def test_no_marking_scheme(self):
+        assert grade_answer({"type": "numeric", "value": "0.5"}, {"type": "numeric", "value": "1/2"}) == (True, None)
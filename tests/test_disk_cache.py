@@ -0,0 +1,84 @@
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.disk_cache import DiskCache
+from utils.file_utils import file_digest
+
+
+class TestDiskCache:
+    """Test DiskCache storage and eviction."""
+
+    def test_get_missing(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        assert cache.get("nope") is None
+
+    def test_put_and_get(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        cache.put("page:1", b"abc")
+        assert cache.get("page:1") == b"abc"
+        assert cache.size_bytes == 3
+
+    def test_overwrite_updates_size(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        cache.put("k", b"12345")
+        cache.put("k", b"12")
+        assert cache.get("k") == b"12"
+        assert cache.size_bytes == 2
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=250)
+        cache.put("a", b"x" * 100)
+        time.sleep(0.01)
+        cache.put("b", b"x" * 100)
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now the oldest
+        time.sleep(0.01)
+        cache.put("c", b"x" * 100)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.size_bytes <= 250
+
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        DiskCache(str(tmp_path), max_bytes=1024).put("k", b"data")
+        reopened = DiskCache(str(tmp_path), max_bytes=1024)
+        assert reopened.size_bytes == 4
+        assert reopened.get("k") == b"data"
+
+    def test_delete(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        cache.put("k", b"data")
+        cache.put("j", b"xy")
+        cache.delete("k")
+        cache.delete("missing")
+        assert cache.get("k") is None
+        assert cache.size_bytes == 2
+
+    def test_clear(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        cache.put("k", b"data")
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.size_bytes == 0
+
+
+class TestFileDigest:
+    """Test file_digest helper."""
+
+    def test_same_content_same_digest(self, tmp_path):
+        a = tmp_path / "a.pdf"
+        b = tmp_path / "b.pdf"
+        a.write_bytes(b"%PDF-1.4 test")
+        b.write_bytes(b"%PDF-1.4 test")
+        assert file_digest(str(a)) == file_digest(str(b))
+
+    def test_different_content(self, tmp_path):
+        a = tmp_path / "a.pdf"
+        b = tmp_path / "b.pdf"
+        a.write_bytes(b"one")
+        b.write_bytes(b"two")
+        assert file_digest(str(a)) != file_digest(str(b))
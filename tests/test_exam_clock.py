@@ -0,0 +1,149 @@
+import sys
+import os
+import pytest
+import fitz
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QSignalSpy
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db import journal
+from ui import exam_clock, test_window
+from ui.exam_clock import ExamClock, TickDriver, format_clock
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """A controllable monotonic clock: now[0] is the current time."""
+    value = [1000.0]
+    monkeypatch.setattr(exam_clock.time, "monotonic", lambda: value[0])
+    return value
+
+
+class TestFormatClock:
+    """Test hh:mm:ss formatting."""
+
+    def test_format(self):
+        assert format_clock(0) == "00:00:00"
+        assert format_clock(3 * 3600 + 5 * 60 + 9) == "03:05:09"
+        assert format_clock(-4) == "00:00:00"
+
+
+class TestExamClock:
+    """Test the deadline-based countdown."""
+
+    def test_counts_from_deadline(self, qapp, now):
+        clock = ExamClock(60, driver=TickDriver())
+        clock.start()
+        now[0] += 10.2
+        assert clock.seconds_left() == 50
+        assert clock.remaining() == pytest.approx(49.8)
+
+    def test_stall_coalesces_into_one_update(self, qapp, now):
+        driver = TickDriver()
+        clock = ExamClock(60, driver=driver)
+        spy = QSignalSpy(clock.second_changed)
+        clock.start()
+        driver._on_timeout()
+        now[0] += 0.1
+        driver._on_timeout()  # same displayed second: no signal
+        now[0] += 7.5  # the GUI thread stalled
+        driver._on_timeout()
+        assert [args[0] for args in spy] == [60, 53]
+
+    def test_stop_freezes_and_start_resumes(self, qapp, now):
+        driver = TickDriver()
+        clock = ExamClock(60, driver=driver)
+        clock.start()
+        now[0] += 20
+        clock.stop()
+        assert not driver.active
+        now[0] += 100
+        assert clock.seconds_left() == 40
+        clock.start()
+        now[0] += 5
+        assert clock.seconds_left() == 35
+
+    def test_expiry_stops_clock(self, qapp, now):
+        driver = TickDriver()
+        clock = ExamClock(3, driver=driver)
+        spy = QSignalSpy(clock.second_changed)
+        clock.start()
+        now[0] += 4
+        driver._on_timeout()
+        assert [args[0] for args in spy] == [0]
+        assert not clock.running and not driver.active
+
+    def test_driver_shared_between_clocks(self, qapp, now):
+        driver = TickDriver()
+        a, b = ExamClock(60, driver=driver), ExamClock(30, driver=driver)
+        a.start(); b.start()
+        assert driver.active
+        a.stop()
+        assert driver.active
+        b.stop()
+        assert not driver.active
+
+    def test_set_remaining_while_running(self, qapp, now):
+        clock = ExamClock(60, driver=TickDriver())
+        clock.start()
+        now[0] += 10
+        clock.set_remaining(600)
+        assert clock.running
+        now[0] += 1
+        assert clock.seconds_left() == 599
+
+
+class TestWindowClock:
+    """Test TestWindow's use of the exam clock."""
+
+    @pytest.fixture
+    def window(self, qapp, tmp_path, monkeypatch, now):
+        monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path / "journals"))
+        pdf = fitz.open()
+        pdf.new_page()
+        pdf_path = str(tmp_path / "paper.pdf")
+        pdf.save(pdf_path)
+        w = test_window.TestWindow(pdf_path, time_limit=1, num_questions=3)
+        yield w
+        w.clock.stop()
+        w.journal.discard()
+        w.close()
+
+    def test_label_follows_deadline(self, window, now):
+        assert window.timer_label.text() == "Time left: 00:01:00"
+        now[0] += 12.5
+        window.clock.tick()
+        assert window.timer_label.text() == "Time left: 00:00:48"
+
+    def test_timer_journaled_after_skipped_seconds(self, window, now):
+        now[0] += 7.5
+        window.clock.tick()
+        window.journal.flush()
+        state = journal.replay_journal(window.journal.path)
+        assert state["time_left_sec"] == 53
+
+    def test_close_stops_clock(self, window):
+        assert window.clock.running
+        window.close()
+        assert not window.clock.running
+
+    def test_close_journals_current_question_time(self, window, now):
+        now[0] += 4.0
+        window.close()
+        state = journal.replay_journal(window.journal.path)
+        assert state["time_spent"][window.current_question] == 4.0
+
+    def test_close_journals_time_left(self, window, now):
+        now[0] += 3.5
+        window.close()
+        assert journal.replay_journal(window.journal.path)["time_left_sec"] == 57
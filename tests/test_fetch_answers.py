@@ -0,0 +1,86 @@
+import sys
+import os
+import re
+import time
+import types
+import threading
+import pytest
+import fitz
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import openai_cache
+from utils.disk_cache import DiskCache
+from scripts.fetch_answers_openai import extract_answers_from_pdf
+
+LATENCY = 0.2
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """
+    Fake openai module with LATENCY per request. Vision checks say "Yes" for pages 2 and 5, with
+    later pages answering sooner; the structuring request echoes the answers it was given.
+    """
+    state = {"active": 0, "peak": 0, "pages": []}
+    lock = threading.Lock()
+
+    def create(model, messages, **params):
+        content = messages[0]["content"]
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            if isinstance(content, list):
+                page = int(re.search(r"page (\d+)", content[0]["text"]).group(1))
+                state["pages"].append(page)
+                time.sleep(LATENCY * (1.5 if page == 2 else 1.0))
+                text = f"Yes 1. {'B' if page == 2 else 'D'}" if page in (2, 5) else "No"
+            else:
+                letters = re.findall(r"Yes 1\. ([A-D])", content)
+                text = "[" + ", ".join(f'{{"type": "mcq", "value": "{c}"}}' for c in letters) + "]"
+        finally:
+            with lock:
+                state["active"] -= 1
+        message = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    fake = types.ModuleType("openai")
+    fake.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    monkeypatch.setitem(sys.modules, "openai", fake)
+    monkeypatch.setattr(openai_cache, "_openai_cache", DiskCache(str(tmp_path / "cache"), 64 * 1024 * 1024))
+    return state
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for i in range(6):
+        doc.new_page(width=200, height=200).insert_text((20, 50), f"Page {i + 1}")
+    path = str(tmp_path / "key.pdf")
+    doc.save(path)
+    return path
+
+
+class TestExtractAnswersFromPdf:
+    """Test concurrent answer key page detection."""
+
+    def test_pages_checked_concurrently_in_page_order(self, api, pdf_path):
+        answers = extract_answers_from_pdf(pdf_path, api_key="test", num_questions=2, max_concurrency=6)
+        # Page 2 answers last but still comes first
+        assert answers == [{"type": "mcq", "value": 1}, {"type": "mcq", "value": 3}]
+        assert sorted(api["pages"]) == [1, 2, 3, 4, 5, 6]
+        # Checks overlapped instead of running one after another
+        assert api["peak"] > 1
+
+    def test_concurrency_is_bounded(self, api, pdf_path):
+        extract_answers_from_pdf(pdf_path, api_key="test", num_questions=2, max_concurrency=2)
+        assert api["peak"] <= 2
+
+    def test_repeat_run_served_from_cache(self, api, pdf_path):
+        extract_answers_from_pdf(pdf_path, api_key="test", num_questions=2)
+        api["pages"].clear()
+        answers = extract_answers_from_pdf(pdf_path, api_key="test", num_questions=2)
+        assert api["pages"] == []
+        assert answers[1] == {"type": "mcq", "value": 3}
@@ -0,0 +1,114 @@
+import sys
+import os
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db.journal import AttemptJournal, replay_journal, unfinished_journals
+
+
+def _start(journal, n=4, time_limit=60):
+    journal.record("start", window="TestWindow", attempt_uuid="u1", pdf_path="paper.pdf", time_limit=time_limit,
+                   num_questions=n, exam_type="NEET", marks_per_correct=4.0, negative_mark=-1.0)
+
+
+class TestAttemptJournal:
+    """Test the background journal writer."""
+
+    def test_flush_writes_lines(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.record("nav", i=2)
+        journal.flush()
+        with open(journal.path) as f:
+            events = [json.loads(line) for line in f]
+        assert [e["e"] for e in events] == ["start", "nav"]
+        journal.close()
+
+    def test_close_writes_pending(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        for i in range(100):
+            journal.record("timer", left=i)
+        journal.close()
+        with open(journal.path) as f:
+            assert len(f.readlines()) == 100
+        journal.record("timer", left=0)  # ignored after close
+
+    def test_reopen_appends(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.close()
+        journal = AttemptJournal(journal.path)
+        journal.record("nav", i=1)
+        journal.close()
+        assert replay_journal(journal.path)["current_question"] == 1
+
+    def test_discard_removes_file(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.flush()
+        assert unfinished_journals(str(tmp_path)) == [journal.path]
+        journal.discard()
+        assert unfinished_journals(str(tmp_path)) == []
+
+
+class TestReplayJournal:
+    """Test rebuilding test state from a journal."""
+
+    def test_replay(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.record("q", i=0, answer={"type": "mcq", "value": 2}, type="mcq", state="answered", review=False)
+        journal.record("q", i=1, answer={"type": "numeric", "value": "3.5"}, type="numeric",
+                       state="review", review=True)
+        journal.record("q", i=0, answer=None, type="mcq", state="not_answered", review=False)
+        journal.record("time", i=0, sec=12.5)
+        journal.record("nav", i=1)
+        journal.record("timer", left=3000)
+        journal.record("time", i=1, sec=4.0)
+        journal.record("time", i=1, sec=9.0)
+        journal.close()
+
+        state = replay_journal(journal.path)
+        assert state["attempt_uuid"] == "u1"
+        assert state["exam_type"] == "NEET"
+        assert state["answers"] == [None, {"type": "numeric", "value": "3.5"}, None, None]
+        assert state["question_types"] == ["mcq", "numeric", "mcq", "mcq"]
+        assert state["question_states"] == ["not_answered", "review", "not_visited", "not_visited"]
+        assert state["review_flags"] == [False, True, False, False]
+        assert state["current_question"] == 1
+        assert state["time_left_sec"] == 3000
+        assert state["time_spent"] == [12.5, 9.0, 0.0, 0.0]
+
+    def test_defaults_without_events(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal, time_limit=90)
+        journal.close()
+        state = replay_journal(journal.path)
+        assert state["time_left_sec"] == 90 * 60
+        assert state["current_question"] == 0
+        assert state["hints_used"] == {}
+
+    def test_replay_hints(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.record("hint", i=2, used=1)
+        journal.record("hint", i=0, used=1)
+        journal.record("hint", i=2, used=2)
+        journal.close()
+        assert replay_journal(journal.path)["hints_used"] == {0: 1, 2: 2}
+
+    def test_torn_last_line_ignored(self, tmp_path):
+        journal = AttemptJournal.for_attempt("u1", root=str(tmp_path))
+        _start(journal)
+        journal.record("nav", i=3)
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"e":"nav","i"')  # crash mid-write
+        assert replay_journal(journal.path)["current_question"] == 3
+
+    def test_no_start_event(self, tmp_path):
+        path = tmp_path / "x.jsonl"
+        path.write_text('{"e":"nav","i":1}\n')
+        assert replay_journal(str(path)) is None
@@ -0,0 +1,107 @@
+import sys
+import os
+import types
+import json
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import openai_cache
+from utils.disk_cache import DiskCache
+from utils.openai_cache import chat_completion_text, request_key
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Replace the openai module with a recorder answering every request with a fixed text."""
+    calls = []
+    reply = {"content": "answer"}
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = types.SimpleNamespace(content=reply["content"])
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    fake = types.ModuleType("openai")
+    fake.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    monkeypatch.setitem(sys.modules, "openai", fake)
+    return calls, reply
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+
+
+MESSAGES = [{"role": "user", "content": "Extract topics"}]
+
+
+class TestRequestKey:
+    """Test cache keys of chat requests."""
+
+    def test_stable_and_parameter_sensitive(self):
+        a = request_key("gpt-4o", MESSAGES, {"temperature": 0.3, "max_tokens": 100})
+        b = request_key("gpt-4o", MESSAGES, {"max_tokens": 100, "temperature": 0.3})
+        assert a == b
+        assert a != request_key("gpt-4o", MESSAGES, {"temperature": 0.0, "max_tokens": 100})
+        assert a != request_key("gpt-4o-mini", MESSAGES, {"temperature": 0.3, "max_tokens": 100})
+        assert a != request_key("gpt-4o", [{"role": "user", "content": "Other"}], {"temperature": 0.3, "max_tokens": 100})
+
+
+class TestChatCompletionText:
+    """Test the on-disk response cache."""
+
+    def test_repeat_request_served_from_cache(self, api, cache):
+        calls, _reply = api
+        assert chat_completion_text("gpt-4o", MESSAGES, cache=cache, temperature=0.3) == "answer"
+        assert chat_completion_text("gpt-4o", MESSAGES, cache=cache, temperature=0.3) == "answer"
+        assert len(calls) == 1
+        assert calls[0] == {"model": "gpt-4o", "messages": MESSAGES, "temperature": 0.3}
+
+    def test_hit_does_not_import_openai(self, api, cache, monkeypatch):
+        chat_completion_text("gpt-4o", MESSAGES, api_key="k1", cache=cache)
+        # Importing openai now fails; a cache hit must not need it
+        monkeypatch.setitem(sys.modules, "openai", None)
+        assert chat_completion_text("gpt-4o", MESSAGES, api_key="k1", cache=cache) == "answer"
+
+    def test_api_key_set_on_miss(self, api, cache):
+        chat_completion_text("gpt-4o", MESSAGES, api_key="k1", cache=cache)
+        assert sys.modules["openai"].api_key == "k1"
+
+    def test_different_parameters_miss(self, api, cache):
+        calls, _reply = api
+        chat_completion_text("gpt-4o", MESSAGES, cache=cache, temperature=0.3)
+        chat_completion_text("gpt-4o", MESSAGES, cache=cache, temperature=0.0)
+        assert len(calls) == 2
+
+    def test_expired_entry_refetched(self, api, cache, monkeypatch):
+        calls, reply = api
+        chat_completion_text("gpt-4o", MESSAGES, cache=cache, ttl=60)
+        later = openai_cache.time.time() + 120
+        monkeypatch.setattr(openai_cache.time, "time", lambda: later)
+        reply["content"] = "fresh"
+        assert chat_completion_text("gpt-4o", MESSAGES, cache=cache, ttl=60) == "fresh"
+        assert len(calls) == 2
+
+    def test_empty_answer_not_cached(self, api, cache):
+        calls, reply = api
+        reply["content"] = ""
+        chat_completion_text("gpt-4o", MESSAGES, cache=cache)
+        chat_completion_text("gpt-4o", MESSAGES, cache=cache)
+        assert len(calls) == 2
+        assert cache.size_bytes == 0
+
+    def test_corrupt_entry_refetched(self, api, cache):
+        calls, _reply = api
+        cache.put(request_key("gpt-4o", MESSAGES, {}), b"not json")
+        assert chat_completion_text("gpt-4o", MESSAGES, cache=cache) == "answer"
+        assert len(calls) == 1
+        entry = json.loads(cache.get(request_key("gpt-4o", MESSAGES, {})))
+        assert entry["content"] == "answer"
+
+    def test_cache_survives_reopen(self, api, tmp_path):
+        calls, _reply = api
+        chat_completion_text("gpt-4o", MESSAGES, cache=DiskCache(str(tmp_path), 1024 * 1024))
+        assert chat_completion_text("gpt-4o", MESSAGES, cache=DiskCache(str(tmp_path), 1024 * 1024)) == "answer"
+        assert len(calls) == 1
@@ -0,0 +1,156 @@
+import sys
+import os
+import time
+import pytest
+import fitz
+from PyQt5.QtWidgets import QApplication
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.pdf_render_service import PageRenderService, VISIBLE_PRIORITY
+from utils.disk_cache import DiskCache
+from utils.fitz_lock import FITZ_LOCK
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for i in range(5):
+        doc.new_page(width=100, height=100).insert_text((10, 50), f"Page {i + 1}")
+    path = str(tmp_path / "paper.pdf")
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def make_service(qapp, pdf_path, tmp_path):
+    """Build a service whose render thread stays blocked (on the MuPDF lock) until release() is called."""
+    services = []
+    held = []
+
+    def make():
+        FITZ_LOCK.acquire()
+        held.append(True)
+        service = PageRenderService(pdf_path, disk_cache=DiskCache(str(tmp_path / "cache"), 1 << 24))
+        rendered = []
+        service.page_rendered.connect(lambda page, zoom, image, words: rendered.append((page, zoom)))
+        services.append(service)
+        return service, rendered
+
+    def release():
+        if held:
+            held.pop()
+            FITZ_LOCK.release()
+
+    yield make, release
+    release()
+    for service in services:
+        service.shutdown()
+
+
+def _wait_for(qapp, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+    return True
+
+
+class TestPageRenderService:
+    """Test job ordering, cancellation and shutdown of the page render service."""
+
+    def test_renders_page_with_words(self, qapp, pdf_path, tmp_path):
+        service = PageRenderService(pdf_path, disk_cache=DiskCache(str(tmp_path / "cache"), 1 << 24))
+        results = []
+        service.page_rendered.connect(lambda page, zoom, image, words: results.append((page, image, words)))
+        try:
+            service.request(2, 1.0)
+            assert _wait_for(qapp, lambda: results)
+            page, image, words = results[0]
+            assert page == 2
+            assert image.image.width() == 100
+            assert words is not None
+            assert not service.is_pending(2)
+        finally:
+            service.shutdown()
+
+    def test_visible_priority_first(self, qapp, make_service):
+        make, release = make_service
+        service, rendered = make()
+        service.request(3, 1.0, priority=5)
+        service.request(2, 1.0, priority=3)
+        service.request(4, 1.0, priority=9)
+        service.request(0, 1.0, priority=VISIBLE_PRIORITY)
+        # Re-requesting a queued page with a better priority moves it up
+        service.request(4, 1.0, priority=1)
+        release()
+        assert _wait_for(qapp, lambda: len(rendered) == 4)
+        assert [page for page, _zoom in rendered] == [0, 4, 2, 3]
+
+    def test_cancelled_job_never_emitted(self, qapp, make_service):
+        make, release = make_service
+        service, rendered = make()
+        service.request(0, 1.0)
+        service.request(1, 1.0, priority=5)
+        service.cancel(0)
+        assert service.pending_pages() == [1]
+        release()
+        assert _wait_for(qapp, lambda: rendered)
+        _wait_for(qapp, lambda: False, timeout=0.1)
+        assert rendered == [(1, 1.0)]
+
+    def test_rezoomed_job_only_emits_latest_zoom(self, qapp, make_service):
+        make, release = make_service
+        service, rendered = make()
+        service.request(0, 1.0)
+        service.request(0, 2.0)
+        release()
+        assert _wait_for(qapp, lambda: rendered)
+        _wait_for(qapp, lambda: False, timeout=0.1)
+        assert rendered == [(0, 2.0)]
+
+    def test_cancel_tiles_keeps_listed(self, qapp, make_service):
+        make, release = make_service
+        service, _rendered = make()
+        tiles = []
+        service.tile_rendered.connect(lambda page, zoom, col, row, image: tiles.append((col, row)))
+        for col in range(3):
+            service.request_tile(0, 3.0, col, 0, tile_size=64)
+        service.cancel_tiles(0, keep={(1, 0)})
+        release()
+        assert _wait_for(qapp, lambda: tiles)
+        _wait_for(qapp, lambda: False, timeout=0.1)
+        assert tiles == [(1, 0)]
+
+    def test_result_finished_after_cancel_is_dropped(self, qapp, make_service):
+        make, release = make_service
+        service, rendered = make()
+        service.request(0, 1.0)
+        generation = service._pending[(0, None)][0]
+        service.cancel(0)
+        # A worker that was already rendering hands in its result late
+        service._on_worker_rendered((0, None), 1.0, generation, None, None)
+        assert rendered == []
+
+    def test_shutdown_joins_worker(self, qapp, make_service):
+        make, release = make_service
+        service, rendered = make()
+        service.request(0, 1.0)
+        release()
+        service.shutdown()
+        assert service._worker.isFinished()
+        service.request(1, 1.0)
+        assert service.pending_pages() == []
+        service.shutdown()  # idempotent
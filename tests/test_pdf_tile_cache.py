@@ -0,0 +1,55 @@
+import sys
+import os
+import pytest
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPixmap
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.pdf_tile_cache import TileCache
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+def _tile(side):
+    image = QImage(side, side, QImage.Format_ARGB32)
+    image.fill(0)
+    return QPixmap.fromImage(image)
+
+
+class TestTileCache:
+    """Test the byte budget and LRU eviction of rendered tiles."""
+
+    def test_byte_budget_and_lru_order(self, qapp):
+        cost = TileCache._cost(_tile(16))
+        cache = TileCache(max_bytes=2 * cost)
+        cache.put("a", _tile(16))
+        cache.put("b", _tile(16))
+        assert cache.size_bytes == 2 * cost
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", _tile(16))
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.size_bytes == 2 * cost
+
+    def test_replacing_a_key_recounts_its_bytes(self, qapp):
+        cache = TileCache(max_bytes=1 << 20)
+        cache.put("a", _tile(32))
+        cache.put("a", _tile(16))
+        assert len(cache) == 1
+        assert cache.size_bytes == TileCache._cost(_tile(16))
+
+    def test_never_evicts_tile_just_added(self, qapp):
+        cache = TileCache(max_bytes=TileCache._cost(_tile(16)))
+        cache.put("small", _tile(16))
+        cache.put("big", _tile(64))
+        assert "big" in cache
+        assert "small" not in cache
+        assert len(cache) == 1
@@ -0,0 +1,105 @@
+import sys
+import os
+import time
+import pytest
+import fitz
+from PyQt5.QtWidgets import QApplication
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui import pdf_render_service
+from ui.pymupdf_selectable_view import SelectablePdfViewer, PREFETCH_VIEWPORTS, KEEP_VIEWPORTS
+from utils.disk_cache import DiskCache
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+def _make_pdf(tmp_path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page(width=200, height=300).insert_text((20, 50), f"Page {i + 1}")
+    path = str(tmp_path / "paper.pdf")
+    doc.save(path)
+    return path
+
+
+def _settle(qapp, v, timeout=5.0):
+    # Let queued visibility passes run and wait for the renders they requested
+    deadline = time.monotonic() + timeout
+    qapp.processEvents()
+    while v._requested or v.render_service.pending_pages():
+        assert time.monotonic() < deadline, "renders did not finish"
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+
+
+def _rendered(v):
+    return {p.page_index for p in v.pages if p.is_rendered}
+
+
+@pytest.fixture
+def viewer(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_render_service, "_page_cache", DiskCache(str(tmp_path / "cache"), 1 << 24))
+    viewers = []
+
+    def make(pages=3, zoom=1.0):
+        v = SelectablePdfViewer(_make_pdf(tmp_path, pages), zoom=zoom)
+        viewers.append(v)
+        return v
+
+    yield make
+    for v in viewers:
+        v.close_document()
+        v.deleteLater()
+
+
+class TestViewerZoom:
+    """Test the viewer's zoom handling."""
+
+    def test_same_zoom_does_not_delay_render(self, viewer):
+        v = viewer(zoom=1.5)
+        v.set_zoom(1.5)
+        assert not v._zoom_settle_timer.isActive()
+
+    def test_zoom_change_waits_to_settle(self, viewer):
+        v = viewer(zoom=1.5)
+        v.set_zoom(2.0)
+        assert v._zoom_settle_timer.isActive()
+        assert v.pages[0].zoom == 2.0
+
+
+class TestViewerLazyRendering:
+    """Test that the viewer only renders pages near the viewport."""
+
+    def test_scroll_prefetches_and_releases(self, qapp, viewer):
+        v = viewer(pages=40)
+        v.resize(300, 400)
+        v.show()
+        _settle(qapp, v)
+        first, last = v.visible_page_range()
+        near_first, near_last = v.visible_page_range(PREFETCH_VIEWPORTS)
+        rendered = _rendered(v)
+        assert set(range(first, last + 1)) <= rendered
+        assert rendered <= set(range(near_first, near_last + 1))
+        assert len(rendered) < len(v.pages)
+
+        v.scroll.verticalScrollBar().setValue(v.scroll.verticalScrollBar().maximum())
+        _settle(qapp, v)
+        first, last = v.visible_page_range()
+        near_first, near_last = v.visible_page_range(PREFETCH_VIEWPORTS)
+        keep_first, _keep_last = v.visible_page_range(KEEP_VIEWPORTS)
+        rendered = _rendered(v)
+        assert set(range(first, last + 1)) <= rendered
+        assert rendered <= set(range(keep_first, len(v.pages)))
+        # The pages rendered at the top were dropped once they were past KEEP_VIEWPORTS
+        assert keep_first > 0
+        assert not rendered & set(range(keep_first))
+        assert not v.pages[0].is_rendered and v.pages[0].page_words is None
@@ -0,0 +1,93 @@
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.pdf_word_boxes import PageWords, WordBoxCache
+
+# (x0, y0, x1, y1, word, block_no, line_no, word_no)
+WORDS = [
+    (10.0, 10.0, 40.0, 20.0, "Which", 0, 0, 0),
+    (45.0, 10.0, 60.0, 20.0, "of", 0, 0, 1),
+    (65.0, 10.0, 90.0, 20.0, "these", 0, 0, 2),
+    (10.0, 30.0, 30.0, 40.0, "(A)", 0, 1, 0),
+    (35.0, 30.0, 80.0, 40.0, "Sodium", 0, 1, 1),
+]
+
+
+class TestPageWords:
+    """Test PageWords storage and hit-testing."""
+
+    def test_len_and_box(self):
+        pw = PageWords(WORDS)
+        assert len(pw) == 5
+        assert pw.box(4) == (35.0, 30.0, 80.0, 40.0)
+
+    def test_intersecting_first_line(self):
+        pw = PageWords(WORDS)
+        assert pw.intersecting(0, 0, 100, 22) == [0, 1, 2]
+
+    def test_intersecting_empty_rect(self):
+        pw = PageWords(WORDS)
+        assert pw.intersecting(20, 20, 20, 50) == []
+
+    def test_text_for_reading_order(self):
+        pw = PageWords(WORDS)
+        assert pw.text_for([4, 0, 3, 2, 1]) == "Which of these\n(A) Sodium"
+
+    def test_text_for_no_words(self):
+        pw = PageWords(WORDS)
+        assert pw.text_for([]) == ""
+
+
+class TestWordBoxCache:
+    """Test the per-document cache."""
+
+    def test_put_and_get(self):
+        cache = WordBoxCache()
+        pw = PageWords(WORDS)
+        assert 3 not in cache
+        cache.put(3, pw)
+        assert 3 in cache
+        assert cache.get(3) is pw
+        assert cache.get(4) is None
+
+
+class TestPageWordsGrid:
+    """Test the grid index against a brute-force scan."""
+
+    def _brute_force(self, words, x0, y0, x1, y1):
+        return [i for i, (a, b, c, d, *_rest) in enumerate(words)
+                if a < x1 and x0 < c and b < y1 and y0 < d]
+
+    def test_grid_matches_linear_scan(self):
+        words = []
+        for row in range(40):
+            for col in range(12):
+                x0, y0 = 20 + col * 47, 30 + row * 18
+                words.append((x0, y0, x0 + 40, y0 + 12, f"w{row}_{col}", 0, row, col))
+        pw = PageWords(words)
+        for rect in [(0, 0, 600, 800), (100, 100, 101, 101), (230, 400, 420, 455),
+                     (-50, -50, 25, 35), (500, 700, 2000, 2000)]:
+            assert pw.intersecting(*rect) == self._brute_force(words, *rect)
+
+    def test_empty_page(self):
+        pw = PageWords([])
+        assert pw.intersecting(0, 0, 100, 100) == []
+
+
+class TestPageWordsSerialization:
+    """Test the byte encoding used by the on-disk page cache."""
+
+    def test_bytes_round_trip(self):
+        pw = PageWords(WORDS)
+        restored = PageWords.from_bytes(pw.to_bytes())
+        assert restored.text == pw.text
+        assert restored.boxes == pw.boxes
+        assert restored.order == pw.order
+        assert restored.intersecting(0, 0, 100, 22) == [0, 1, 2]
+
+    def test_bytes_round_trip_empty(self):
+        restored = PageWords.from_bytes(PageWords([]).to_bytes())
+        assert len(restored) == 0
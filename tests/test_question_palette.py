@@ -0,0 +1,101 @@
+import sys
+import os
+import pytest
+import fitz
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QSignalSpy
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db import journal
+from ui import test_window
+from ui.question_palette import QuestionPaletteModel, QuestionPaletteView, STATE_ROLE, CURRENT_ROLE
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path / "journals"))
+    pdf = fitz.open()
+    pdf.new_page()
+    pdf_path = str(tmp_path / "paper.pdf")
+    pdf.save(pdf_path)
+    w = test_window.TestWindow(pdf_path, time_limit=30, num_questions=12)
+    w.clock.stop()
+    yield w
+    w.journal.discard()
+    w.close()
+
+
+def _state(w, idx):
+    model = w.palette_view.palette_model
+    return model.data(model.index(idx), STATE_ROLE)
+
+
+def _current(w, idx):
+    model = w.palette_view.palette_model
+    return model.data(model.index(idx), CURRENT_ROLE)
+
+
+class TestQuestionPaletteModel:
+    """Test the palette model over a shared question_states list."""
+
+    def test_rows_follow_shared_states(self, qapp):
+        states = ["not_visited"] * 3
+        model = QuestionPaletteModel(states)
+        assert model.rowCount() == 3
+        assert model.data(model.index(1)) == "2"
+        states[1] = "answered"
+        assert model.data(model.index(1), STATE_ROLE) == "answered"
+
+    def test_set_current_repaints_two_rows(self, qapp):
+        model = QuestionPaletteModel(["not_visited"] * 5000)
+        spy = QSignalSpy(model.dataChanged)
+        model.set_current(4000)
+        assert [args[0].row() for args in spy] == [0, 4000]
+        assert model.data(model.index(4000), CURRENT_ROLE) is True
+        assert model.data(model.index(0), CURRENT_ROLE) is False
+
+    def test_clicks_emit_question_index(self, qapp):
+        view = QuestionPaletteView(["not_visited"] * 10)
+        spy = QSignalSpy(view.question_clicked)
+        view.clicked.emit(view.palette_model.index(7))
+        assert [args[0] for args in spy] == [7]
+
+
+class TestWindowPalette:
+    """Test TestWindow driving the palette."""
+
+    def test_navigation(self, window):
+        assert _current(window, 0) is True
+        window.palette_view.question_clicked.emit(4)
+        assert window.current_question == 4
+        assert _state(window, 0) == "not_answered"
+        assert _current(window, 0) is False
+        assert _current(window, 4) is True
+
+    def test_review_and_answered_states(self, window):
+        window.options[2].setChecked(True)
+        window.save_and_mark_for_review()
+        assert _state(window, 0) == "review"
+        window.go_to_question(1)
+        window.options[1].setChecked(True)
+        window.save_and_next()
+        assert _state(window, 1) == "answered"
+        assert _current(window, 2) is True
+
+    def test_restore_switches_state_list(self, window):
+        state = {"answers": [None] * 12, "question_types": ["mcq"] * 12,
+                 "question_states": ["answered"] * 12, "review_flags": [False] * 12,
+                 "time_spent": [0.0] * 12, "current_question": 5, "time_left_sec": 600}
+        window._restore_state(state)
+        assert _state(window, 11) == "answered"
+        assert _current(window, 5) is True
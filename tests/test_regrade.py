@@ -0,0 +1,86 @@
+import sys
+import os
+import json
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db import storage
+from scripts.regrade_attempts import grade_chunk, regrade, main
+
+
+OLD_KEY = [{"type": "mcq", "value": 0}, {"type": "numeric", "value": "2"}, {"type": "mcq", "value": 1}]
+NEW_KEY = [{"type": "mcq", "value": 1}, {"type": "numeric", "value": "2.0"}, {"type": "mcq", "value": 1}]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.sqlite3")
+    storage.init_db(path)
+    answers = [{"type": "mcq", "value": 1}, {"type": "numeric", "value": "2"}, None]
+    for n in range(5):
+        uuid = f"a{n}"
+        rows = [{"attempt_uuid": uuid, "question_index": i, "selected_answer": answers[i],
+                 "correct_answer": OLD_KEY[i], "time_spent_sec": 10} for i in range(3)]
+        session = {"attempt_uuid": uuid, "pdf_hash": "h1" if n < 4 else "h2",
+                   "marks_per_correct": 4.0, "negative_mark": -1.0}
+        storage.log_attempts(rows, path=path, session=session)
+    return path
+
+
+class TestGradeChunk:
+    """Test grading one chunk of stored rows."""
+
+    def test_uses_session_marking(self):
+        rows = [(1, "u", 0, "mcq", "B", None, 4.0, -1.0), (2, "u", 1, "mcq", "C", None, 4.0, -1.0),
+                (3, "u", 2, None, None, None, None, None), (4, "u", 5, "mcq", "A", None, 4.0, -1.0)]
+        updates = grade_chunk(rows, NEW_KEY)
+        assert updates[0] == (1, "mcq", "B", None, 1, 4.0, 1)
+        assert updates[1] == (None, "numeric", "2.0", 2.0, 0, -1.0, 2)  # wrong answer type counts as wrong
+        assert updates[2][4:] == (None, None, 3)  # skipped, no marking scheme recorded
+        assert updates[3] == (None, None, None, None, None, 0.0, 4)  # beyond the key
+
+    def test_override_marking(self):
+        rows = [(1, "u", 0, "mcq", "A", None, 4.0, -1.0)]
+        assert grade_chunk(rows, NEW_KEY, 3.0, -0.5)[0][4:] == (0, -0.5, 1)
+
+
+class TestRegrade:
+    """Test regrading stored attempts."""
+
+    def test_regrade_by_pdf_hash(self, db_path):
+        before = storage.get_attempt_summary("a0", path=db_path)
+        assert before["score"] == 3.0  # -1 + 4
+        rows, attempts = regrade(NEW_KEY, pdf_hash="h1", path=db_path)
+        assert (rows, attempts) == (12, 4)
+        after = storage.get_attempt_summary("a0", path=db_path)
+        assert after["correct"] == 2
+        assert after["score"] == 8.0
+        untouched = storage.get_attempt_summary("a4", path=db_path)
+        assert untouched["score"] == 3.0
+        row = storage.get_attempts_for_attempt_id("a0", path=db_path)[0]
+        assert row["correct_answer"] == 1
+        assert row["correct_value"] == "B"
+
+    def test_chunked_process_pool(self, db_path):
+        rows, attempts = regrade(NEW_KEY, attempt_uuids=["a1", "a2", "a4"], marks_per_correct=3.0,
+                                 chunk_size=2, workers=2, path=db_path)
+        assert (rows, attempts) == (9, 3)
+        for uuid in ("a1", "a2", "a4"):
+            assert storage.get_attempt_summary(uuid, path=db_path)["score"] == 6.0
+            session = storage.get_session(uuid, path=db_path)
+            assert session["marks_per_correct"] == 3.0
+            assert session["negative_mark"] == -1.0
+        assert storage.get_attempt_summary("a0", path=db_path)["score"] == 3.0
+
+    def test_nothing_selected(self, db_path):
+        assert regrade(NEW_KEY, attempt_uuids=["missing"], path=db_path) == (0, 0)
+
+    def test_cli(self, db_path, tmp_path, capsys):
+        key_file = tmp_path / "key.json"
+        key_file.write_text(json.dumps(NEW_KEY))
+        assert main([str(key_file), "--all", "--db", db_path, "--workers", "1"]) == 0
+        assert "Regraded 15 rows across 5 attempts" in capsys.readouterr().out
+        with pytest.raises(SystemExit):
+            main([str(key_file), "--db", db_path])
@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import result_stats
+from utils.result_stats import ResultStats, get_result_stats, invalidate_result_stats
+
+
+ANSWERS = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}, {"type": "numeric", "value": "2"},
+           None, {"type": "text", "value": "NaCl"}]
+KEY = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 2}, {"type": "numeric", "value": "2.0"},
+       {"type": "mcq", "value": 3}, {"type": "text", "value": "nacl"}]
+
+
+class TestResultStats:
+    """Test the per-attempt stats model."""
+
+    def test_totals(self):
+        stats = ResultStats(ANSWERS, KEY, 4.0, -1.0)
+        assert stats.num_questions == 5
+        assert (stats.attempted, stats.correct, stats.incorrect, stats.not_attempted) == (4, 3, 1, 1)
+        assert stats.score == 11.0
+        assert stats.max_score == 20.0
+        assert stats.negative_total == 1.0
+        assert stats.attempted_accuracy == 75.0
+        assert stats.pie_counts == (3, 1, 1)
+
+    def test_rows(self):
+        stats = ResultStats(ANSWERS, KEY, 4.0, -1.0)
+        assert [r.type for r in stats.rows] == ["mcq", "mcq", "numeric", "mcq", "text"]
+        assert stats.rows[1].user_display == "B"
+        assert stats.rows[1].correct_display == "C"
+        assert stats.rows[3].user_display == "--"
+        assert [r.marks for r in stats.rows] == [4.0, -1.0, 4.0, 0.0, 4.0]
+        assert [r.correct for r in stats.rows] == [True, False, True, False, True]
+
+    def test_by_type(self):
+        stats = ResultStats(ANSWERS, KEY)
+        assert stats.by_type["mcq"]["accuracy"] == 50.0
+        assert stats.by_type["numeric"]["accuracy"] == 100.0
+
+    def test_short_key(self):
+        stats = ResultStats(ANSWERS, KEY[:2])
+        assert stats.questions_with_key == 2
+        assert stats.rows[4].correct_display == "--"
+
+
+class TestGetResultStats:
+    """Test memoization of ResultStats."""
+
+    def setup_method(self):
+        invalidate_result_stats()
+
+    def test_memoized_by_content(self):
+        a = get_result_stats(ANSWERS, KEY, 4.0, -1.0)
+        b = get_result_stats([dict(x) if x else None for x in ANSWERS], list(KEY), 4.0, -1.0)
+        assert a is b
+        assert get_result_stats(ANSWERS, KEY, 3.0, -1.0) is not a
+
+    def test_memoized_by_attempt(self):
+        a = get_result_stats(ANSWERS, KEY, attempt_uuid="u1")
+        assert get_result_stats(ANSWERS, KEY, attempt_uuid="u1") is a
+        invalidate_result_stats("u1")
+        assert get_result_stats(ANSWERS, KEY, attempt_uuid="u1") is not a
+
+    def test_cache_bounded(self):
+        for i in range(result_stats.STATS_CACHE_SIZE + 5):
+            get_result_stats(ANSWERS, KEY, attempt_uuid=f"u{i}")
+        assert len(result_stats._cache) == result_stats.STATS_CACHE_SIZE
@@ -0,0 +1,78 @@
+import sys
+import os
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.results_table_model import ResultsTableModel
+from utils.result_stats import ResultStats
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+def _model():
+    answers = [
+        {"type": "mcq", "value": 0},        # Q1 correct
+        {"type": "mcq", "value": 3},        # Q2 wrong
+        None,                               # Q3 not attempted
+        {"type": "numeric", "value": "7"},  # Q4 attempted, no key
+        {"type": "text", "value": "abc"},   # Q5 correct
+    ]
+    key = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}, {"type": "mcq", "value": 2},
+           None, {"type": "text", "value": "ABC"}]
+    return ResultsTableModel(ResultStats(answers, key, 4.0, -1.0))
+
+
+def _column(model, col):
+    return [model.data(model.index(r, col)) for r in range(model.rowCount())]
+
+
+class TestResultsTableModel:
+    """Test the question-wise results model."""
+
+    def test_cells(self, qapp):
+        model = _model()
+        assert model.rowCount() == 5 and model.columnCount() == 4
+        assert _column(model, 0) == ["Q1", "Q2", "Q3", "Q4", "Q5"]
+        assert _column(model, 1) == ["MCQ", "MCQ", "MCQ", "NUMERIC", "TEXT"]
+        assert _column(model, 2)[:3] == ["A", "D", "--"]
+        assert model.headerData(2, Qt.Horizontal) == "Your Answer"
+
+    def test_colors(self, qapp):
+        model = _model()
+        def bg(row, col):
+            brush = model.data(model.index(row, col), Qt.BackgroundRole)
+            return brush.color() if brush is not None else None
+        assert bg(0, 2) == Qt.green
+        assert bg(1, 2) == Qt.red and bg(1, 3) == Qt.green
+        assert bg(2, 2) == Qt.lightGray and bg(2, 3) is None
+        assert bg(3, 2) == Qt.lightGray
+
+    def test_sort_by_outcome_and_back(self, qapp):
+        model = _model()
+        model.sort(2, Qt.AscendingOrder)
+        assert _column(model, 0) == ["Q1", "Q5", "Q2", "Q4", "Q3"]
+        model.sort(0, Qt.DescendingOrder)
+        assert _column(model, 0) == ["Q5", "Q4", "Q3", "Q2", "Q1"]
+
+    def test_filter_keeps_sort(self, qapp):
+        model = _model()
+        model.sort(0, Qt.DescendingOrder)
+        model.set_filter("Correct")
+        assert _column(model, 0) == ["Q5", "Q1"]
+        model.set_filter("Wrong")
+        assert _column(model, 0) == ["Q2"]
+        model.set_filter("Not attempted")
+        assert _column(model, 0) == ["Q3"]
+        model.set_filter("All")
+        assert model.rowCount() == 5
+        assert model.question_row(0).index == 4
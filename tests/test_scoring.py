@@ -0,0 +1,118 @@
+import sys
+import os
+import random
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.answers import compare_answers
+from utils.scoring import (
+    AnswerColumns, grade, score_answers, score_columns, TYPE_MCQ, TYPE_NUMERIC, TYPE_TEXT, TYPE_NONE
+)
+
+
+def _random_item(rng):
+    kind = rng.choice(["none", "mcq", "mcq_bad", "numeric", "numeric_bad", "text", "legacy"])
+    if kind == "none":
+        return None
+    if kind == "mcq":
+        return {"type": "mcq", "value": rng.randrange(4)}
+    if kind == "mcq_bad":
+        return {"type": "mcq", "value": 7}
+    if kind == "numeric":
+        return {"type": "numeric", "value": rng.choice(["1/2", "0.5", "0.5004", "2", " 2.0 ", "-3", "1/3"])}
+    if kind == "numeric_bad":
+        return {"type": "numeric", "value": rng.choice(["abc", "x/2", "abc "])}
+    if kind == "text":
+        return {"type": "text", "value": rng.choice(["NaCl", " nacl ", "Sodium  chloride", "sodium chloride"])}
+    return rng.choice([0, 3, "B", "answer"])
+
+
+class TestAnswerColumns:
+    """Test the columnar encoding."""
+
+    def test_from_items(self):
+        cols = AnswerColumns.from_items([
+            {"type": "mcq", "value": 2}, {"type": "numeric", "value": " 1/4 "},
+            {"type": "text", "value": " Sodium  Chloride "}, None, {"type": "numeric", "value": None},
+        ])
+        assert list(cols.types) == [TYPE_MCQ, TYPE_NUMERIC, TYPE_TEXT, TYPE_NONE, TYPE_NONE]
+        assert cols.mcq[0] == 2 and cols.mcq[1] == -1
+        assert cols.numeric[1] == 0.25 and np.isnan(cols.numeric[0])
+        assert cols.text[1] == "1/4"
+        assert cols.text[2] == "sodium chloride"
+        assert len(cols) == 5
+
+
+class TestGrade:
+    """Test that vectorized grading agrees with compare_answers."""
+
+    def test_matches_scalar_rules(self):
+        rng = random.Random(7)
+        user = [_random_item(rng) for _ in range(2000)]
+        key = [_random_item(rng) for _ in range(2000)]
+        attempted, correct, has_key = grade(AnswerColumns.from_items(user), AnswerColumns.from_items(key))
+        for i in range(len(user)):
+            assert (bool(attempted[i]), bool(correct[i]), bool(has_key[i])) == compare_answers(user[i], key[i]), i
+
+    def test_numeric_tolerance(self):
+        user = AnswerColumns.from_items([{"type": "numeric", "value": "0.5009"}, {"type": "numeric", "value": "0.502"}])
+        key = AnswerColumns.from_items([{"type": "numeric", "value": "1/2"}, {"type": "numeric", "value": "1/2"}])
+        _attempted, correct, _has_key = grade(user, key)
+        assert list(correct) == [True, False]
+
+
+class TestScoreAnswers:
+    """Test summary totals."""
+
+    def test_summary(self):
+        answers = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}, {"type": "numeric", "value": "2"},
+                   None, {"type": "text", "value": "x"}]
+        key = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 2}, {"type": "numeric", "value": "2.0"},
+               {"type": "mcq", "value": 3}, None]
+        result = score_answers(answers, key, 4.0, -1.0)
+        assert result.attempted_count == 4
+        assert result.correct_count == 2
+        assert result.incorrect_count == 2
+        assert result.incorrect_scored_count == 1  # the text answer has no key
+        assert result.not_attempted_count == 1
+        assert result.questions_with_key == 4
+        assert result.score == 7.0
+        assert result.max_score == 20.0
+        assert result.attempted_accuracy == 50.0
+        assert list(result.marks()) == [4.0, -1.0, 4.0, 0.0, 0.0]
+        assert result.by_type() == {
+            "mcq": {"questions": 3, "attempted": 2, "correct": 1, "wrong": 1},
+            "numeric": {"questions": 1, "attempted": 1, "correct": 1, "wrong": 0},
+            "text": {"questions": 1, "attempted": 1, "correct": 0, "wrong": 1},
+        }
+
+    def test_short_key_padded(self):
+        result = score_answers([{"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}], [{"type": "mcq", "value": 0}])
+        assert result.correct_count == 1
+        assert result.questions_with_key == 1
+
+    def test_empty(self):
+        result = score_answers([], [])
+        assert result.attempted_count == 0
+        assert result.overall_accuracy == 0.0
+
+
+class TestBatchScoring:
+    """Test grading many attempts against one key."""
+
+    def test_stacked_attempts(self):
+        rng = random.Random(3)
+        key_items = [{"type": "mcq", "value": rng.randrange(4)} for _ in range(180)]
+        attempts = [[{"type": "mcq", "value": rng.randrange(4)} if rng.random() < 0.8 else None for _ in range(180)]
+                    for _ in range(3000)]
+        users = AnswerColumns.stack([AnswerColumns.from_items(a) for a in attempts])
+        key = AnswerColumns.from_items(key_items)
+
+        result = score_columns(users, key, 4.0, -1.0)
+
+        assert result.score.shape == (3000,)
+        expected = score_answers(attempts[17], key_items, 4.0, -1.0)
+        assert result.score[17] == expected.score
+        assert result.correct_count[17] == expected.correct_count
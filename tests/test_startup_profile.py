@@ -0,0 +1,65 @@
+import sys
+import os
+import io
+import builtins
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.startup_profile import ImportProfiler
+
+
+def _write_module(tmp_path, name, body=""):
+    (tmp_path / f"{name}.py").write_text(body)
+
+
+class TestImportProfiler:
+    """Test import timing and the startup report."""
+
+    def test_times_new_imports_with_nesting(self, tmp_path, monkeypatch):
+        _write_module(tmp_path, "profiled_inner", "X = 1\n")
+        _write_module(tmp_path, "profiled_outer", "import profiled_inner\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        for name in ("profiled_inner", "profiled_outer"):
+            monkeypatch.delitem(sys.modules, name, raising=False)
+
+        profiler = ImportProfiler()
+        profiler.install()
+        try:
+            import profiled_outer  # noqa: F401
+        finally:
+            profiler.uninstall()
+
+        assert set(profiler.inclusive) >= {"profiled_outer", "profiled_inner"}
+        assert profiler.inclusive["profiled_outer"] >= profiler.inclusive["profiled_inner"]
+        # The nested import is not counted in the outer module's self time
+        assert profiler.self_time["profiled_outer"] <= profiler.inclusive["profiled_outer"] - profiler.inclusive["profiled_inner"] + 1e-9
+
+    def test_already_loaded_modules_are_not_recorded(self):
+        profiler = ImportProfiler()
+        profiler.install()
+        try:
+            import json  # noqa: F401
+        finally:
+            profiler.uninstall()
+        assert "json" not in profiler.inclusive
+
+    def test_uninstall_restores_import(self):
+        original = builtins.__import__
+        profiler = ImportProfiler()
+        profiler.install()
+        assert builtins.__import__ is not original
+        profiler.uninstall()
+        assert builtins.__import__ is original
+
+    def test_report_lists_milestones_and_packages(self):
+        profiler = ImportProfiler()
+        profiler.inclusive = {"pkg.a": 0.2, "pkg.b": 0.1, "other": 0.05}
+        profiler.self_time = {"pkg.a": 0.1, "pkg.b": 0.1, "other": 0.05}
+        assert profiler.by_package() == {"pkg": 0.2, "other": 0.05}
+
+        out = io.StringIO()
+        profiler.report([("first window painted", profiler.started + 0.5)], out=out)
+        text = out.getvalue()
+        assert "first window painted" in text and "500.0 ms" in text
+        assert text.index("pkg.a") < text.index("pkg.b") < text.index("other")
@@ -0,0 +1,250 @@
+import sys
+import os
+import sqlite3
+import threading
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db import storage
+from utils.result_stats import ResultStats
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.sqlite3")
+    storage.init_db(path)
+    return path
+
+
+def _rows(attempt_uuid, n):
+    return [
+        {
+            "attempt_uuid": attempt_uuid,
+            "question_index": i,
+            "selected_answer": i % 4,
+            "correct_answer": (i + 1) % 4,
+            "time_spent_sec": 10 * i,
+            "hint_count": 0,
+        }
+        for i in range(n)
+    ]
+
+
+class TestLogAttempts:
+    """Test bulk attempt logging."""
+
+    def test_bulk_insert(self, db_path):
+        assert storage.log_attempts(_rows("a1", 180), path=db_path) == 180
+        rows = storage.get_attempts_for_attempt_id("a1", path=db_path)
+        assert len(rows) == 180
+        assert rows[5]["selected_answer"] == 1
+        assert rows[5]["correct_answer"] == 2
+        assert rows[5]["time_spent_sec"] == 50
+
+    def test_empty_rows(self, db_path):
+        assert storage.log_attempts([], path=db_path) == 0
+
+    def test_failed_batch_is_rolled_back(self, db_path):
+        rows = _rows("a2", 3)
+        rows[2]["time_spent_sec"] = object()  # not bindable
+        with pytest.raises(Exception):
+            storage.log_attempts(rows, path=db_path)
+        assert storage.get_attempts_for_attempt_id("a2", path=db_path) == []
+
+    def test_single_and_bulk_agree(self, db_path):
+        storage.log_attempt("a3", 0, 2, 2, 30, hint_count=1, path=db_path)
+        storage.log_attempts([{"attempt_uuid": "a3", "question_index": 1, "selected_answer": None,
+                               "correct_answer": 1, "time_spent_sec": 5}], path=db_path)
+        rows = storage.get_attempts_for_attempt_id("a3", path=db_path)
+        assert [r["question_index"] for r in rows] == [0, 1]
+        assert rows[0]["hint_count"] == 1
+        assert rows[1]["hint_count"] == 0
+
+    def test_clear_attempts(self, db_path):
+        storage.log_attempts(_rows("a4", 4), path=db_path)
+        storage.clear_attempts_for_attempt_id("a4", path=db_path)
+        assert storage.get_attempts_for_attempt_id("a4", path=db_path) == []
+
+
+class TestConnectionPool:
+    """Test per-thread connection reuse and pragmas."""
+
+    def test_connection_reused(self, db_path):
+        with storage.get_conn(db_path) as c1:
+            pass
+        with storage.get_conn(db_path) as c2:
+            pass
+        assert c1 is c2
+
+    def test_pragmas(self, db_path):
+        with storage.get_conn(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_connection_per_thread(self, db_path):
+        with storage.get_conn(db_path) as main_conn:
+            pass
+        seen = []
+
+        def worker():
+            with storage.get_conn(db_path) as conn:
+                seen.append(conn)
+            storage.close_all_conns()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen and seen[0] is not main_conn
+
+    def test_close_conn_reopens(self, db_path):
+        with storage.get_conn(db_path) as c1:
+            pass
+        storage.close_conn(db_path)
+        with storage.get_conn(db_path) as c2:
+            pass
+        assert c1 is not c2
+
+    def test_error_rolls_back(self, db_path):
+        with pytest.raises(RuntimeError):
+            with storage.get_conn(db_path) as conn:
+                conn.execute("INSERT INTO attempts (attempt_uuid, question_index) VALUES (?, ?)", ("a5", 0))
+                raise RuntimeError("boom")
+        assert storage.get_attempts_for_attempt_id("a5", path=db_path) == []
+
+
+class TestSchemaMigrations:
+    """Test user_version migrations, indexes and the sessions table."""
+
+    def test_fresh_db_at_latest_version(self, db_path):
+        with storage.get_conn(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == storage.SCHEMA_VERSION
+
+    def test_indexes_used(self, db_path):
+        with storage.get_conn(db_path) as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN " + storage.SELECT_ATTEMPTS_SQL, ("x",)).fetchall()
+        assert any("idx_attempts_uuid_question" in row[-1] for row in plan)
+
+    def test_legacy_db_migrated_in_place(self, tmp_path):
+        path = str(tmp_path / "legacy.sqlite3")
+        legacy = sqlite3.connect(path)
+        legacy.execute("""
+        CREATE TABLE attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            attempt_uuid TEXT,
+            question_index INTEGER,
+            selected_answer INTEGER,
+            correct_answer INTEGER,
+            time_spent_sec INTEGER,
+            hint_count INTEGER DEFAULT 0,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        legacy.executemany("INSERT INTO attempts (attempt_uuid, question_index, selected_answer, correct_answer) "
+                           "VALUES (?, ?, ?, ?)",
+                           [("old", 0, 1, 1), ("old", 1, 2, 0), ("old", 2, None, 3)])
+        legacy.commit()
+        legacy.close()
+
+        storage.init_db(path)
+        storage.init_db(path)  # second start is a no-op
+        rows = storage.get_attempts_for_attempt_id("old", path=path)
+        assert [r["selected_value"] for r in rows] == ["B", "C", None]
+        assert [r["correct_value"] for r in rows] == ["B", "A", "D"]
+        assert [r["is_correct"] for r in rows] == [1, 0, None]
+        assert all(r["marks"] is None for r in rows)  # no marking scheme was recorded
+        session = storage.get_session("old", path=path)
+        assert session["num_questions"] == 3
+        assert session["exam_type"] is None
+        with storage.get_conn(path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == storage.SCHEMA_VERSION
+        storage.close_conn(path)
+
+    def test_log_session(self, db_path):
+        storage.log_session("s1", exam_type="JEE", pdf_hash="abc", num_questions=90, time_limit_min=180,
+                            marks_per_correct=4.0, negative_mark=1.0, path=db_path)
+        session = storage.get_session("s1", path=db_path)
+        assert session["exam_type"] == "JEE"
+        assert session["pdf_hash"] == "abc"
+        assert session["marks_per_correct"] == 4.0
+        assert storage.get_session("missing", path=db_path) is None
+
+    def test_session_logged_with_attempts(self, db_path):
+        storage.log_attempts(_rows("s2", 5), path=db_path,
+                             session={"attempt_uuid": "s2", "exam_type": "NEET", "num_questions": 5})
+        assert storage.get_session("s2", path=db_path)["num_questions"] == 5
+        storage.clear_attempts_for_attempt_id("s2", path=db_path)
+        assert storage.get_session("s2", path=db_path) is None
+
+
+class TestTypedAnswers:
+    """Test typed answer columns and SQL summaries."""
+
+    def _log_mixed(self, db_path, attempt_uuid="t1"):
+        rows = [
+            {"attempt_uuid": attempt_uuid, "question_index": 0, "selected_answer": {"type": "mcq", "value": 1},
+             "correct_answer": {"type": "mcq", "value": 1}, "time_spent_sec": 30},
+            {"attempt_uuid": attempt_uuid, "question_index": 1, "selected_answer": {"type": "numeric", "value": "0.5"},
+             "correct_answer": {"type": "numeric", "value": "1/2"}, "time_spent_sec": 60},
+            {"attempt_uuid": attempt_uuid, "question_index": 2, "selected_answer": {"type": "text", "value": "Iron"},
+             "correct_answer": {"type": "text", "value": "copper"}, "time_spent_sec": 20},
+            {"attempt_uuid": attempt_uuid, "question_index": 3, "selected_answer": None,
+             "correct_answer": {"type": "mcq", "value": 0}, "time_spent_sec": 5},
+        ]
+        session = {"attempt_uuid": attempt_uuid, "marks_per_correct": 4.0, "negative_mark": -1.0}
+        storage.log_attempts(rows, path=db_path, session=session)
+
+    def test_every_type_stored(self, db_path):
+        self._log_mixed(db_path)
+        rows = storage.get_attempts_for_attempt_id("t1", path=db_path)
+        assert [r["answer_type"] for r in rows] == ["mcq", "numeric", "text", "mcq"]
+        assert [r["selected_value"] for r in rows] == ["B", "0.5", "Iron", None]
+        assert rows[1]["selected_numeric"] == 0.5
+        assert rows[1]["correct_numeric"] == 0.5
+        assert rows[0]["selected_answer"] == 1  # MCQ index kept in the legacy column
+        assert rows[1]["selected_answer"] is None
+        assert rows[1]["correct_answer"] is None
+        assert [r["is_correct"] for r in rows] == [1, 1, 0, None]
+        assert [r["marks"] for r in rows] == [4.0, 4.0, -1.0, 0.0]
+
+    def test_attempt_summary(self, db_path):
+        self._log_mixed(db_path)
+        summary = storage.get_attempt_summary("t1", path=db_path)
+        assert summary["num_questions"] == 4
+        assert summary["attempted"] == 3
+        assert summary["correct"] == 2
+        assert summary["incorrect"] == 1
+        assert summary["score"] == 7.0
+        assert summary["time_spent_sec"] == 115
+        assert storage.get_attempt_summary("missing", path=db_path) is None
+
+    def test_summary_score_unknown_without_marking_scheme(self, db_path):
+        storage.log_attempts(_rows("u1", 3), path=db_path)
+        assert storage.get_attempt_summary("u1", path=db_path)["score"] is None
+
+    def test_history_and_type_accuracy(self, db_path):
+        self._log_mixed(db_path, "t1")
+        self._log_mixed(db_path, "t2")
+        history = storage.get_history_summary(path=db_path)
+        assert [h["attempt_uuid"] for h in history] == ["t1", "t2"]
+        by_type = {r["answer_type"]: r for r in storage.get_accuracy_by_type(path=db_path)}
+        assert by_type["mcq"]["questions"] == 4
+        assert by_type["mcq"]["accuracy"] == 100.0
+        assert by_type["text"]["accuracy"] == 0.0
+
+    def test_type_accuracy_matches_result_stats(self, db_path):
+        answers = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 1}, None,
+                   {"type": "numeric", "value": "2"}, {"type": "numeric", "value": "3"}, None]
+        key = [{"type": "mcq", "value": 0}, {"type": "mcq", "value": 2}, {"type": "mcq", "value": 3},
+               {"type": "numeric", "value": "2.0"}, {"type": "numeric", "value": "4"},
+               {"type": "numeric", "value": "1"}]
+        rows = [{"attempt_uuid": "m1", "question_index": i, "selected_answer": a, "correct_answer": k,
+                 "time_spent_sec": 10} for i, (a, k) in enumerate(zip(answers, key))]
+        storage.log_attempts(rows, path=db_path, session={"attempt_uuid": "m1"})
+        stats = ResultStats(answers, key)
+        by_type = {r["answer_type"]: r for r in storage.get_accuracy_by_type(path=db_path)}
+        assert set(by_type) == set(stats.by_type)
+        for typ, expected in stats.by_type.items():
+            assert by_type[typ]["attempted"] == expected["attempted"]
+            assert by_type[typ]["accuracy"] == pytest.approx(expected["accuracy"])